@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from pathlib import Path
 from typing import Any, Mapping
 
@@ -111,9 +112,15 @@ class Backend(BaseSQLBackend):
         ----------
         treat_nan_as_null : bool
             Treat NaNs in floating point expressions as NULL.
+        cache_compiled : bool
+            Reuse the DataFrame compiled for an expression when the same
+            expression is compiled again without parameters. Cached
+            DataFrames do not pick up tables replaced in the catalog since
+            they were compiled.
         """
 
         treat_nan_as_null: bool = False
+        cache_compiled: bool = False
 
     def _from_url(self, url: str) -> Backend:
         """Construct a PySpark backend from a URL `url`."""
@@ -157,6 +164,10 @@ class Backend(BaseSQLBackend):
         # https://spark.apache.org/docs/latest/sql-pyspark-pandas-with-arrow.html#timestamp-with-time-zone-semantics
         self._session.conf.set('spark.sql.session.timeZone', 'UTC')
 
+        self._compile_cached = functools.lru_cache(maxsize=128)(
+            self._translate_with_options
+        )
+
     @property
     def version(self):
         return pyspark.__version__
@@ -200,15 +211,29 @@ class Backend(BaseSQLBackend):
 
         # Insert params in scope
         if params is None:
+            if ibis.config.options.pyspark.cache_compiled:
+                return self._compile_cached(
+                    expr.op(),
+                    timecontext,
+                    ibis.config.options.pyspark.treat_nan_as_null,
+                )
             scope = Scope()
         else:
             scope = Scope(
                 {param.op(): raw_value for param, raw_value in params.items()},
                 timecontext,
             )
+        return self._translate(expr.op(), timecontext, scope=scope)
+
+    def _translate_with_options(self, op, timecontext, treat_nan_as_null):
+        # `treat_nan_as_null` is read from the options during translation, it
+        # is only passed here so that it is part of the cache key
+        return self._translate(op, timecontext)
+
+    def _translate(self, op, timecontext, scope=None):
         return PySparkExprTranslator().translate(
-            expr.op(),
-            scope=scope,
+            op,
+            scope=Scope() if scope is None else scope,
             timecontext=timecontext,
             session=self._session,
         )
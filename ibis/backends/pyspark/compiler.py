@@ -1,11 +1,15 @@
 import collections
+import contextlib
 import enum
 import functools
+import operator
+import re
 
 import pandas as pd
 import pyspark
 import pyspark.sql.functions as F
 import pyspark.sql.types as pt
+from packaging.version import parse as vparse
 from pyspark.sql import Window
 from pyspark.sql.functions import PandasUDFType, pandas_udf
 
@@ -16,7 +20,6 @@ import ibis.expr.operations as ops
 import ibis.expr.types as ir
 from ibis import interval
 from ibis.backends.pandas.client import PandasInMemoryTable
-from ibis.backends.pandas.execution import execute
 from ibis.backends.pyspark.datatypes import (
     ibis_array_dtype_to_spark_dtype,
     ibis_dtype_to_spark_dtype,
@@ -44,10 +47,21 @@ class AggregationContext(enum.Enum):
 class PySparkExprTranslator:
     _registry = {}
 
+    def __init__(self):
+        # translations that depend on the raw or aggcontext keyword arguments
+        # are memoized here instead of in scope, so that e.g. a raw literal
+        # is never handed out where a column is expected
+        self._memo = {}
+        self._window_specs = {}
+        self._interval_exprs = {}
+        # names of the catalog's tables and non-temporary views, listed at
+        # most once per translation
+        self._persistent_tables = None
+
     @classmethod
-    def compiles(cls, klass):
+    def compiles(cls, *klasses):
         def decorator(f):
-            cls._registry[klass] = f
+            cls._registry.update(dict.fromkeys(klasses, f))
             return f
 
         return decorator
@@ -68,18 +82,30 @@ class PySparkExprTranslator:
         result = scope.get_value(op, timecontext)
         if result is not None:
             return result
-        elif type(op) in self._registry:
-            formatter = self._registry[type(op)]
-            result = formatter(
-                self, op, scope=scope, timecontext=timecontext, **kwargs
-            )
-            scope.set_value(op, timecontext, result)
-            return result
-        else:
+
+        raw = kwargs.get('raw', False)
+        aggcontext = kwargs.get('aggcontext')
+        contextual = raw or aggcontext is not None
+        if contextual:
+            key = op, timecontext, raw, aggcontext
+            if (result := self._memo.get(key)) is not None:
+                return result
+
+        formatter = self._registry.get(type(op))
+        if formatter is None:
             raise com.OperationNotDefinedError(
                 f'No translation rule for {type(op)}'
             )
 
+        result = formatter(
+            self, op, scope=scope, timecontext=timecontext, **kwargs
+        )
+        if contextual:
+            self._memo[key] = result
+        else:
+            scope.set_value(op, timecontext, result)
+        return result
+
 
 compiles = PySparkExprTranslator.compiles
 
@@ -149,16 +175,20 @@ def compile_selection(t, op, *, scope, timecontext, **kwargs):
     col_to_drop = []
     result_table = src_table
 
-    for predicate in op.predicates:
-        col = t.translate(
-            predicate, scope=scope, timecontext=timecontext, **kwargs
+    if op.predicates:
+        predicate = functools.reduce(
+            operator.and_,
+            (
+                t.translate(p, scope=scope, timecontext=timecontext, **kwargs)
+                for p in op.predicates
+            ),
         )
         # Due to an upstream Spark issue (SPARK-33057) we cannot
         # directly use filter with a window operation. The workaround
         # here is to assign a temporary column for the filter predicate,
         # do the filtering, and then drop the temporary column.
         filter_column = f'predicate_{guid()}'
-        result_table = result_table.withColumn(filter_column, col)
+        result_table = result_table.withColumn(filter_column, predicate)
         result_table = result_table.filter(F.col(filter_column))
         result_table = result_table.drop(filter_column)
 
@@ -184,7 +214,12 @@ def compile_selection(t, op, *, scope, timecontext, **kwargs):
             raise NotImplementedError(
                 f"Unrecoginized type in selections: {type(selection)}"
             )
-    if col_in_selection_order:
+    # Selecting every column of the source table in its original order is a
+    # no-op projection, so skip it rather than adding a Project to the plan
+    is_identity = all(
+        isinstance(selection, ops.TableNode) for selection in op.selections
+    ) and col_in_selection_order == list(op.table.schema.names)
+    if col_in_selection_order and not is_identity:
         result_table = result_table[col_in_selection_order]
 
     if col_to_drop:
@@ -212,12 +247,14 @@ def compile_nan_as_null(compile_func):
     @functools.wraps(compile_func)
     def wrapper(t, op, *args, **kwargs):
         compiled = compile_func(t, op, *args, **kwargs)
-        if options.pyspark.treat_nan_as_null and isinstance(
-            op.output_dtype, dt.Floating
+        # raw literals are plain python values that F.nanvl cannot wrap
+        if (
+            not options.pyspark.treat_nan_as_null
+            or kwargs.get('raw', False)
+            or not isinstance(op.output_dtype, dt.Floating)
         ):
-            return F.nanvl(compiled, F.lit(None))
-        else:
             return compiled
+        return F.nanvl(compiled, F.lit(None))
 
     return wrapper
 
@@ -271,14 +308,29 @@ def compile_limit(t, op, **kwargs):
     return df.limit(op.n)
 
 
+def _flatten_bool(op, klass):
+    """Yield the operands of a chain of `klass` connectives, left to right."""
+    if isinstance(op, klass):
+        yield from _flatten_bool(op.left, klass)
+        yield from _flatten_bool(op.right, klass)
+    else:
+        yield op
+
+
 @compiles(ops.And)
 def compile_and(t, op, **kwargs):
-    return t.translate(op.left, **kwargs) & t.translate(op.right, **kwargs)
+    return functools.reduce(
+        operator.and_,
+        (t.translate(arg, **kwargs) for arg in _flatten_bool(op, ops.And)),
+    )
 
 
 @compiles(ops.Or)
 def compile_or(t, op, **kwargs):
-    return t.translate(op.left, **kwargs) | t.translate(op.right, **kwargs)
+    return functools.reduce(
+        operator.or_,
+        (t.translate(arg, **kwargs) for arg in _flatten_bool(op, ops.Or)),
+    )
 
 
 @compiles(ops.Xor)
@@ -344,8 +396,8 @@ def compile_literal(t, op, *, raw=False, **kwargs):
         return value
 
     if isinstance(dtype, dt.Interval):
-        # execute returns a Timedelta and value is nanoseconds
-        return execute(op).value
+        # Timedelta.value is in nanoseconds
+        return pd.Timedelta(value, dtype.unit).value
 
     if isinstance(value, collections.abc.Set):
         # Don't wrap set with F.lit
@@ -367,8 +419,10 @@ def compile_aggregation(t, op, **kwargs):
     src_table = t.translate(op.table, **kwargs)
 
     if op.predicates:
-        predicate = functools.reduce(ops.And, op.predicates)
-        src_table = src_table.filter(t.translate(predicate, **kwargs))
+        predicate = functools.reduce(
+            operator.and_, (t.translate(p, **kwargs) for p in op.predicates)
+        )
+        src_table = src_table.filter(predicate)
 
     if op.by:
         aggcontext = AggregationContext.GROUP
@@ -383,12 +437,80 @@ def compile_aggregation(t, op, **kwargs):
     return src_table.agg(*aggs)
 
 
+_complementary_comparisons = {
+    ops.Less: ops.GreaterEqual,
+    ops.GreaterEqual: ops.Less,
+    ops.LessEqual: ops.Greater,
+    ops.Greater: ops.LessEqual,
+    ops.Equals: ops.NotEquals,
+    ops.NotEquals: ops.Equals,
+}
+
+
+def _peel_filters(op):
+    """Return the table under a chain of filter/sort-only selections along
+    with the predicates applied on top of it."""
+    predicates = []
+    while isinstance(op, ops.Selection) and not op.selections:
+        predicates.extend(op.predicates)
+        op = op.table
+    return op, predicates
+
+
+def _is_distinct(op):
+    if isinstance(op, (ops.Distinct, ops.Aggregation)):
+        return True
+    return isinstance(op, ops.SetOp) and op.distinct
+
+
+def _column_comparison_key(pred):
+    if isinstance(pred.left, ops.TableColumn) and isinstance(
+        pred.right, ops.Literal
+    ):
+        return pred.left.name, pred.right.value
+    return None
+
+
+def _are_disjoint(left_predicates, right_predicates):
+    """Whether some pair of predicates, such as `x < 5` and `x >= 5`, can
+    never hold for the same row."""
+    for left_pred in left_predicates:
+        complement = _complementary_comparisons.get(type(left_pred))
+        if complement is None:
+            continue
+        key = _column_comparison_key(left_pred)
+        if key is None:
+            continue
+        for right_pred in right_predicates:
+            if (
+                type(right_pred) is complement
+                and _column_comparison_key(right_pred) == key
+            ):
+                return True
+    return False
+
+
+def _union_is_distinct(op):
+    """Whether the union of both sides of `op` can't contain duplicates."""
+    left_table, left_predicates = _peel_filters(op.left)
+    right_table, right_predicates = _peel_filters(op.right)
+    return (
+        _is_distinct(left_table)
+        and _is_distinct(right_table)
+        and _are_disjoint(left_predicates, right_predicates)
+    )
+
+
 @compiles(ops.Union)
 def compile_union(t, op, **kwargs):
     left = t.translate(op.left, **kwargs)
     right = t.translate(op.right, **kwargs)
     result = left.union(right)
-    return result.distinct() if op.distinct else result
+    # distinct requires a shuffle, avoid it when the inputs are known to be
+    # distinct and disjoint
+    if op.distinct and not _union_is_distinct(op):
+        return result.distinct()
+    return result
 
 
 @compiles(ops.Intersection)
@@ -405,16 +527,41 @@ def compile_difference(t, op, **kwargs):
     return left.subtract(right) if op.distinct else left.exceptAll(right)
 
 
+def _is_plain_literal(op):
+    """Whether `op` is an integer, string or boolean literal whose python
+    value can be handed to Spark as-is."""
+    return isinstance(op, ops.Literal) and isinstance(
+        op.output_dtype, (dt.Integer, dt.String, dt.Boolean)
+    )
+
+
+def _raw_options(options):
+    """Return the deduplicated python values of `options` if it is a list of
+    plain integer, string or boolean literals, otherwise None."""
+    if not isinstance(options, ops.NodeList):
+        return None
+    if not all(map(_is_plain_literal, options)):
+        return None
+    return list(dict.fromkeys(option.value for option in options))
+
+
+def _compile_isin(t, op, **kwargs):
+    col = t.translate(op.value, **kwargs)
+    # Passing the values as-is skips translating every literal and keeps the
+    # expression eligible for Spark's hash-set based IN optimization
+    if (options := _raw_options(op.options)) is None:
+        options = t.translate(op.options, **kwargs)
+    return col.isin(options)
+
+
 @compiles(ops.Contains)
 def compile_contains(t, op, **kwargs):
-    col = t.translate(op.value, **kwargs)
-    return col.isin(t.translate(op.options, **kwargs))
+    return _compile_isin(t, op, **kwargs)
 
 
 @compiles(ops.NotContains)
 def compile_not_contains(t, op, **kwargs):
-    col = t.translate(op.value, **kwargs)
-    return ~(col.isin(t.translate(op.options, **kwargs)))
+    return ~_compile_isin(t, op, **kwargs)
 
 
 @compiles(ops.StartsWith)
@@ -428,7 +575,7 @@ def compile_startswith(t, op, **kwargs):
 def compile_endswith(t, op, **kwargs):
     col = t.translate(op.arg, **kwargs)
     end = t.translate(op.end, **kwargs)
-    return col.startswith(end)
+    return col.endswith(end)
 
 
 def _is_table(table):
@@ -452,27 +599,27 @@ def compile_aggregator(t, op, *, fn, aggcontext=None, **kwargs):
             src_col = F.when(condition, src_col)
         return src_col
 
-    src_inputs = tuple(
-        arg for arg in op.args if arg is not getattr(op, "where", None)
-    )
     src_cols = tuple(
-        translate_arg(arg) for arg in src_inputs if isinstance(arg, ops.Node)
+        translate_arg(arg)
+        for arg in op.args
+        if arg is not where and isinstance(arg, ops.Node)
     )
 
     col = fn(*src_cols)
     if aggcontext:
         return col
+
+    # We are trying to compile a expr such as some_col.max()
+    # to a Spark expression.
+    # Here we get the root table df of that column and compile
+    # the expr to:
+    # df.select(max(some_col))
+    if _is_table(op):
+        (src_table,) = src_cols
     else:
-        # We are trying to compile a expr such as some_col.max()
-        # to a Spark expression.
-        # Here we get the root table df of that column and compile
-        # the expr to:
-        # df.select(max(some_col))
-        if _is_table(op):
-            (src_col,) = src_cols
-            return src_col.select(col)
         table_op = an.find_first_base_table(op)
-        return t.translate(table_op, **kwargs).select(col)
+        src_table = t.translate(table_op, **kwargs)
+    return src_table.select(col)
 
 
 @compiles(ops.GroupConcat)
@@ -556,26 +703,22 @@ def compile_count_star(t, op, aggcontext=None, **kwargs):
         return src_table.select(col)
 
 
-@compiles(ops.Max)
-@compiles(ops.CumulativeMax)
+@compiles(ops.Max, ops.CumulativeMax)
 def compile_max(t, op, **kwargs):
     return compile_aggregator(t, op, fn=F.max, **kwargs)
 
 
-@compiles(ops.Min)
-@compiles(ops.CumulativeMin)
+@compiles(ops.Min, ops.CumulativeMin)
 def compile_min(t, op, **kwargs):
     return compile_aggregator(t, op, fn=F.min, **kwargs)
 
 
-@compiles(ops.Mean)
-@compiles(ops.CumulativeMean)
+@compiles(ops.Mean, ops.CumulativeMean)
 def compile_mean(t, op, **kwargs):
     return compile_aggregator(t, op, fn=F.mean, **kwargs)
 
 
-@compiles(ops.Sum)
-@compiles(ops.CumulativeSum)
+@compiles(ops.Sum, ops.CumulativeSum)
 def compile_sum(t, op, **kwargs):
     return compile_aggregator(t, op, fn=F.sum, **kwargs)
 
@@ -626,10 +769,9 @@ def compile_covariance(t, op, **kwargs):
 
     fn = {"sample": F.covar_samp, "pop": F.covar_pop}[how]
 
-    pyspark_double_type = ibis_dtype_to_spark_dtype(dt.double)
     new_op = op.__class__(
-        left=ops.Cast(op.left, to=pyspark_double_type),
-        right=ops.Cast(op.right, to=pyspark_double_type),
+        left=ops.Cast(op.left, to=dt.double),
+        right=ops.Cast(op.right, to=dt.double),
         how=how,
         where=op.where,
     )
@@ -641,10 +783,9 @@ def compile_correlation(t, op, **kwargs):
     if (how := op.how) == "pop":
         raise ValueError("PySpark only implements sample correlation")
 
-    pyspark_double_type = ibis_dtype_to_spark_dtype(dt.double)
     new_op = op.__class__(
-        left=ops.Cast(op.left, to=pyspark_double_type),
-        right=ops.Cast(op.right, to=pyspark_double_type),
+        left=ops.Cast(op.left, to=dt.double),
+        right=ops.Cast(op.right, to=dt.double),
         how=how,
         where=op.where,
     )
@@ -665,37 +806,64 @@ def compile_arbitrary(t, op, **kwargs):
     return compile_aggregator(t, op, fn=fn, **kwargs)
 
 
-@compiles(ops.Coalesce)
-def compile_coalesce(t, op, **kwargs):
-    src_columns = t.translate(op.arg, **kwargs)
+def _compile_variadic(t, op, fn, **kwargs):
+    kwargs["raw"] = False  # override to force column literals
+    src_columns = tuple(t.translate(arg, **kwargs) for arg in op.arg.values)
     if len(src_columns) == 1:
         return src_columns[0]
     else:
-        return F.coalesce(*src_columns)
+        return fn(*src_columns)
+
+
+@compiles(ops.Coalesce)
+def compile_coalesce(t, op, **kwargs):
+    return _compile_variadic(t, op, F.coalesce, **kwargs)
 
 
 @compiles(ops.Greatest)
 def compile_greatest(t, op, **kwargs):
-    src_columns = t.translate(op.arg, **kwargs)
-    if len(src_columns) == 1:
-        return src_columns[0]
-    else:
-        return F.greatest(*src_columns)
+    return _compile_variadic(t, op, F.greatest, **kwargs)
 
 
 @compiles(ops.Least)
 def compile_least(t, op, **kwargs):
-    src_columns = t.translate(op.arg, **kwargs)
-    if len(src_columns) == 1:
-        return src_columns[0]
-    else:
-        return F.least(*src_columns)
-
+    return _compile_variadic(t, op, F.least, **kwargs)
+
+
+def _compile_unary(fn):
+    def compile_unary(t, op, **kwargs):
+        return fn(t.translate(op.arg, **kwargs))
+
+    return compile_unary
+
+
+_unary_native_functions = {
+    ops.Abs: F.abs,
+    ops.Ceil: F.ceil,
+    ops.Floor: F.floor,
+    ops.Exp: F.exp,
+    ops.Acos: F.acos,
+    ops.Asin: F.asin,
+    ops.Atan: F.atan,
+    ops.Cos: F.cos,
+    ops.Sin: F.sin,
+    ops.Tan: F.tan,
+    ops.Sqrt: F.sqrt,
+    ops.Ln: F.log,
+    ops.Log2: F.log2,
+    ops.Log10: F.log10,
+    ops.Uppercase: F.upper,
+    ops.Lowercase: F.lower,
+    ops.Reverse: F.reverse,
+    ops.Strip: F.trim,
+    ops.LStrip: F.ltrim,
+    ops.RStrip: F.rtrim,
+    ops.Capitalize: F.initcap,
+    ops.StringLength: F.length,
+}
 
-@compiles(ops.Abs)
-def compile_abs(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.abs(src_column)
+for _klass, _fn in _unary_native_functions.items():
+    compiles(_klass)(_compile_unary(_fn))
 
 
 @compiles(ops.Clip)
@@ -745,24 +913,6 @@ def compile_round(t, op, **kwargs):
     return rounded
 
 
-@compiles(ops.Ceil)
-def compile_ceil(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.ceil(src_column)
-
-
-@compiles(ops.Floor)
-def compile_floor(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.floor(src_column)
-
-
-@compiles(ops.Exp)
-def compile_exp(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.exp(src_column)
-
-
 @compiles(ops.Sign)
 def compile_sign(t, op, **kwargs):
     src_column = t.translate(op.arg, **kwargs)
@@ -772,12 +922,6 @@ def compile_sign(t, op, **kwargs):
     )
 
 
-@compiles(ops.Sqrt)
-def compile_sqrt(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.sqrt(src_column)
-
-
 @compiles(ops.Log)
 def compile_log(t, op, **kwargs):
     src_column = t.translate(op.arg, **kwargs)
@@ -790,24 +934,6 @@ def compile_log(t, op, **kwargs):
         return F.log(base, src_column)
 
 
-@compiles(ops.Ln)
-def compile_ln(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.log(src_column)
-
-
-@compiles(ops.Log2)
-def compile_log2(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.log2(src_column)
-
-
-@compiles(ops.Log10)
-def compile_log10(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.log10(src_column)
-
-
 @compiles(ops.Modulus)
 def compile_modulus(t, op, **kwargs):
     left = t.translate(op.left, **kwargs)
@@ -854,109 +980,73 @@ def compile_power(t, op, **kwargs):
 @compiles(ops.IsNan)
 def compile_isnan(t, op, **kwargs):
     src_column = t.translate(op.arg, **kwargs)
-    return F.isnan(src_column) | F.isnull(src_column)
+    # nulls are reported as NaN, fold them in before a single isnan check
+    return F.isnan(F.coalesce(src_column, F.lit(float('nan'))))
 
 
 @compiles(ops.IsInf)
 def compile_isinf(t, op, **kwargs):
     src_column = t.translate(op.arg, **kwargs)
-    return (src_column == float('inf')) | (src_column == float('-inf'))
-
-
-@compiles(ops.Uppercase)
-def compile_uppercase(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.upper(src_column)
-
-
-@compiles(ops.Lowercase)
-def compile_lowercase(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.lower(src_column)
-
-
-@compiles(ops.Reverse)
-def compile_reverse(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.reverse(src_column)
-
-
-@compiles(ops.Strip)
-def compile_strip(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.trim(src_column)
-
-
-@compiles(ops.LStrip)
-def compile_lstrip(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.ltrim(src_column)
-
-
-@compiles(ops.RStrip)
-def compile_rstrip(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.rtrim(src_column)
-
-
-@compiles(ops.Capitalize)
-def compile_capitalize(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.initcap(src_column)
+    return F.abs(src_column) == float('inf')
 
 
 @compiles(ops.Substring)
 def compile_substring(t, op, **kwargs):
     src_column = t.translate(op.arg, **kwargs)
-    start = t.translate(op.start, **kwargs, raw=True) + 1
-    length = t.translate(op.length, **kwargs, raw=True)
-
-    if isinstance(start, pyspark.sql.Column) or isinstance(
-        length, pyspark.sql.Column
-    ):
-        raise NotImplementedError(
-            "Specifiying Start and length with column expressions "
-            "are not supported."
-        )
+    start, length = op.start, op.length
 
-    return src_column.substr(start, length)
+    if isinstance(start, ops.Literal) and isinstance(length, ops.Literal):
+        return src_column.substr(start.value + 1, length.value)
 
-
-@compiles(ops.StringLength)
-def compile_string_length(t, op, **kwargs):
-    src_column = t.translate(op.arg, **kwargs)
-    return F.length(src_column)
+    # Column.substr requires start and length to both be columns otherwise
+    start_column = t.translate(start, **kwargs) + 1
+    if length is None:
+        length_column = F.length(src_column)
+    else:
+        length_column = t.translate(length, **kwargs)
+    return src_column.substr(start_column, length_column)
 
 
 @compiles(ops.StrRight)
 def compile_str_right(t, op, **kwargs):
-    @F.udf('string')
-    def str_right(s, nchars):
-        return s[-nchars:]
-
     src_column = t.translate(op.arg, **kwargs)
     nchars_column = t.translate(op.nchars, **kwargs)
-    return str_right(src_column, nchars_column)
+    return src_column.substr(-nchars_column, nchars_column)
 
 
 @compiles(ops.Repeat)
 def compile_repeat(t, op, **kwargs):
-    @F.udf('string')
-    def repeat(s, times):
-        return s * times
-
     src_column = t.translate(op.arg, **kwargs)
+    if isinstance(op.times, ops.Literal):
+        return F.repeat(src_column, op.times.value)
+
+    # F.repeat only accepts a python integer for the number of repetitions
     times_column = t.translate(op.times, **kwargs)
-    return repeat(src_column, times_column)
+    return F.array_join(F.array_repeat(src_column, times_column), '')
 
 
 @compiles(ops.StringFind)
 def compile_string_find(t, op, **kwargs):
+    src_column = t.translate(op.arg, **kwargs)
+    # negative bounds count from the end of each string, which locate and
+    # substring cannot express
+    if isinstance(op.substr, ops.Literal) and all(
+        bound is None
+        or (isinstance(bound, ops.Literal) and (bound.value or 0) >= 0)
+        for bound in (op.start, op.end)
+    ):
+        substr = op.substr.value
+        start = getattr(op.start, 'value', None) or 0
+        end = getattr(op.end, 'value', None)
+        if end is not None:
+            src_column = F.substring(src_column, 1, end)
+        # locate is 1-based and returns 0 when substr is not found
+        return (F.locate(substr, src_column, start + 1) - 1).cast('long')
+
     @F.udf('long')
     def str_find(s, substr, start, end):
         return s.find(substr, start, end)
 
-    src_column = t.translate(op.arg, **kwargs)
     substr_column = t.translate(op.substr, **kwargs)
     start_column = t.translate(op.start, **kwargs) if op.start else F.lit(None)
     end_column = t.translate(op.end, **kwargs) if op.end else F.lit(None)
@@ -989,24 +1079,36 @@ def compile_rpad(t, op, **kwargs):
 
 @compiles(ops.StringJoin)
 def compile_string_join(t, op, **kwargs):
+    arg = t.translate(op.arg, **kwargs)
+    if isinstance(op.sep, ops.Literal):
+        return F.array_join(F.array(arg), op.sep.value)
+
     @F.udf('string')
     def join(sep, arr):
         return sep.join(arr)
 
     sep_column = t.translate(op.sep, **kwargs)
-    arg = t.translate(op.arg, **kwargs)
     return join(sep_column, F.array(arg))
 
 
 @compiles(ops.RegexSearch)
 def compile_regex_search(t, op, **kwargs):
-    import re
-
-    @F.udf('boolean')
-    def regex_search(s, pattern):
-        return True if re.search(pattern, s) else False
-
     src_column = t.translate(op.arg, **kwargs)
+    if isinstance(op.pattern, ops.Literal):
+        return src_column.rlike(op.pattern.value)
+
+    @pandas_udf('boolean', PandasUDFType.SCALAR)
+    def regex_search(strings, patterns):
+        # compile each distinct pattern once per batch
+        compile_pattern = functools.lru_cache(maxsize=None)(re.compile)
+        return pd.Series(
+            [
+                compile_pattern(p).search(s) is not None
+                for s, p in zip(strings, patterns)
+            ],
+            index=strings.index,
+        )
+
     pattern = t.translate(op.pattern, **kwargs)
     return regex_search(src_column, pattern)
 
@@ -1060,6 +1162,10 @@ def compile_string_like(t, op, **kwargs):
 
 @compiles(ops.ValueList)
 def compile_value_list(t, op, **kwargs):
+    # plain literals need none of the literal rule's special cases, so wrap
+    # them directly instead of dispatching every element
+    if all(map(_is_plain_literal, op.values)):
+        return [F.lit(value.value) for value in op.values]
     kwargs["raw"] = False  # override to force column literals
     return [t.translate(col, **kwargs) for col in op.values]
 
@@ -1094,6 +1200,58 @@ def compile_left_anti_join(t, op, **kwargs):
     return compile_join(t, op, **kwargs, how='leftanti')
 
 
+def _constant_equalities(table):
+    """Return a mapping of column name to literal for `table`'s filters.
+
+    Only top-level ``column == literal`` predicates of a selection that
+    passes its source columns through unchanged are considered.
+    """
+    if not isinstance(table, ops.Selection) or not all(
+        selection == table.table for selection in table.selections
+    ):
+        return {}
+
+    constants = {}
+    for pred in table.predicates:
+        if not isinstance(pred, ops.Equals):
+            continue
+        column, value = pred.left, pred.right
+        if isinstance(column, ops.Literal):
+            column, value = value, column
+        if (
+            isinstance(column, ops.TableColumn)
+            and column.table == table.table
+            and isinstance(value, ops.Literal)
+            and value.value is not None
+            and not isinstance(value.output_dtype, dt.Interval)
+        ):
+            constants[column.name] = value
+    return constants
+
+
+# Join types for which a constant filter on one input may be copied onto the
+# other input's join key, as (left -> right, right -> left)
+_join_filter_propagation = {
+    'inner': (True, True),
+    'left': (True, False),
+    'right': (False, True),
+    'leftsemi': (True, False),
+    'leftanti': (True, False),
+}
+
+
+def _propagate_constant_filter(t, df, source, names, **kwargs):
+    constants = _constant_equalities(source)
+    predicates = [
+        F.col(name) == t.translate(constants[name], **kwargs)
+        for name in names
+        if name in constants
+    ]
+    if not predicates:
+        return df
+    return df.filter(functools.reduce(operator.and_, predicates))
+
+
 def compile_join(t, op, how, **kwargs):
     left_df = t.translate(op.left, **kwargs)
     right_df = t.translate(op.right, **kwargs)
@@ -1108,6 +1266,19 @@ def compile_join(t, op, how, **kwargs):
             )
         pred_columns.append(pred.left.name)
 
+    # Spark does not always infer `right.key = c` from `left.key = c` and
+    # `left.key = right.key` before the exchange, so do it here to shrink
+    # the shuffled side
+    to_right, to_left = _join_filter_propagation.get(how, (False, False))
+    if to_right:
+        right_df = _propagate_constant_filter(
+            t, right_df, op.left, pred_columns, **kwargs
+        )
+    if to_left:
+        left_df = _propagate_constant_filter(
+            t, left_df, op.right, pred_columns, **kwargs
+        )
+
     return left_df.join(right_df, pred_columns, how)
 
 
@@ -1124,9 +1295,19 @@ def _canonicalize_interval(t, interval, **kwargs):
     correspondingly.
     """
     if isinstance(interval, ir.IntervalScalar):
-        value = t.translate(interval.op(), **kwargs)
-        # value is in nanoseconds and spark uses seconds since epoch
-        return int(value / 1e9)
+        op = interval.op()
+        # rangeBetween needs the bound as a python integer, so only literal
+        # intervals can be used and they are folded here
+        if not isinstance(op, ops.Literal):
+            raise com.UnsupportedOperationError(
+                'Only literal intervals are supported in preceding /following '
+                'in window.'
+            )
+        nanos = pd.Timedelta(op.value, op.output_dtype.unit).value
+        # spark uses seconds since epoch, sub-second bounds are truncated
+        # towards zero
+        seconds = abs(nanos) // 1_000_000_000
+        return seconds if nanos >= 0 else -seconds
     elif isinstance(interval, int):
         return interval
     else:
@@ -1136,11 +1317,27 @@ def _canonicalize_interval(t, interval, **kwargs):
         )
 
 
-@compiles(ops.Window)
-def compile_window_op(t, op, **kwargs):
-    window = op.window
-    operand = op.expr
+_order_insensitive_reductions = (
+    ops.All,
+    ops.Any,
+    ops.ApproxCountDistinct,
+    ops.Count,
+    ops.CountStar,
+    ops.Max,
+    ops.Mean,
+    ops.Min,
+    ops.NotAll,
+    ops.NotAny,
+    ops.StandardDev,
+    ops.Sum,
+    ops.Variance,
+)
+
 
+def _compile_window_spec(t, window, *, ordered, is_shift, **kwargs):
+    # Partition keys are passed in the order they were given (the window
+    # already removed duplicates). Ordering them by cardinality would need
+    # column statistics that the session catalog doesn't expose cheaply.
     grouping_keys = [
         key.name
         if isinstance(key, ops.TableColumn)
@@ -1154,13 +1351,13 @@ def compile_window_op(t, op, **kwargs):
         if isinstance(sort.output_dtype, dt.Timestamp)
         else sort.name
         for sort in window._order_by
+        if ordered
     ]
-    aggcontext = AggregationContext.WINDOW
     pyspark_window = Window.partitionBy(grouping_keys).orderBy(ordering_keys)
 
     # If the operand is a shift op (e.g. lead, lag), Spark will set the window
     # bounds. Only set window bounds here if not a shift operation.
-    if not isinstance(operand, ops.ShiftBase):
+    if not is_shift:
         if window.preceding is None:
             start = Window.unboundedPreceding
         else:
@@ -1179,6 +1376,32 @@ def compile_window_op(t, op, **kwargs):
         else:
             pyspark_window = pyspark_window.rowsBetween(start, end)
 
+    return pyspark_window
+
+
+@compiles(ops.Window)
+def compile_window_op(t, op, **kwargs):
+    window = op.window
+    operand = op.expr
+
+    # Reductions over the whole partition that don't depend on the order of
+    # their input don't need the partition to be sorted
+    ordered = not (
+        window.preceding is None
+        and window.following is None
+        and isinstance(operand, _order_insensitive_reductions)
+    )
+    is_shift = isinstance(operand, ops.ShiftBase)
+
+    # Window specs only depend on the window frame, reuse them across every
+    # expression computed over the same window
+    key = window, ordered, is_shift, kwargs.get('timecontext')
+    if (pyspark_window := t._window_specs.get(key)) is None:
+        pyspark_window = t._window_specs[key] = _compile_window_spec(
+            t, window, ordered=ordered, is_shift=is_shift, **kwargs
+        )
+
+    aggcontext = AggregationContext.WINDOW
     res_op = operand
     if isinstance(res_op, (ops.NotAll, ops.NotAny)):
         # For NotAll and NotAny, negation must be applied after .over(window)
@@ -1243,8 +1466,7 @@ def compile_cume_dist(t, op, **kwargs):
 
 @compiles(ops.NTile)
 def compile_ntile(t, op, **kwargs):
-    buckets = op.buckets.value
-    return F.ntile(buckets)
+    return F.ntile(_literal_int(op.buckets, 'buckets'))
 
 
 @compiles(ops.FirstValue)
@@ -1262,8 +1484,20 @@ def compile_last_value(t, op, **kwargs):
 @compiles(ops.NthValue)
 def compile_nth_value(t, op, **kwargs):
     src_column = t.translate(op.arg, **kwargs)
-    nth = t.translate(op.nth, **kwargs, raw=True)
-    return F.nth_value(src_column, nth + 1)
+    return F.nth_value(src_column, _literal_int(op.nth, 'nth') + 1)
+
+
+def _literal_int(op, name):
+    """Return the python integer of the literal `op`.
+
+    Spark requires some function arguments, such as nth_value's offset, to
+    be known when the expression is built rather than given as a column.
+    """
+    if not isinstance(op, ops.Literal):
+        raise com.UnsupportedOperationError(
+            f'PySpark backend only supports a literal {name} argument'
+        )
+    return op.value
 
 
 @compiles(ops.RowNumber)
@@ -1292,75 +1526,29 @@ def compile_date(t, op, **kwargs):
     return F.to_date(src_column).cast('timestamp')
 
 
-def _extract_component_from_datetime(t, op, extract_fn, **kwargs):
-    date_col = t.translate(op.arg, **kwargs)
-    return extract_fn(date_col).cast('integer')
-
-
-@compiles(ops.ExtractYear)
-def compile_extract_year(t, op, **kwargs):
-    return _extract_component_from_datetime(t, op, extract_fn=F.year, **kwargs)
-
-
-@compiles(ops.ExtractMonth)
-def compile_extract_month(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.month, **kwargs
-    )
-
-
-@compiles(ops.ExtractDay)
-def compile_extract_day(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.dayofmonth, **kwargs
-    )
-
-
-@compiles(ops.ExtractDayOfYear)
-def compile_extract_day_of_year(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.dayofyear, **kwargs
-    )
-
-
-@compiles(ops.ExtractQuarter)
-def compile_extract_quarter(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.quarter, **kwargs
-    )
-
-
-@compiles(ops.ExtractEpochSeconds)
-def compile_extract_epoch_seconds(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.unix_timestamp, **kwargs
-    )
-
-
-@compiles(ops.ExtractWeekOfYear)
-def compile_extract_week_of_year(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.weekofyear, **kwargs
-    )
-
+def _compile_extract_component(extract_fn):
+    def compile_extract_component(t, op, **kwargs):
+        date_col = t.translate(op.arg, **kwargs)
+        return extract_fn(date_col).cast('integer')
 
-@compiles(ops.ExtractHour)
-def compile_extract_hour(t, op, **kwargs):
-    return _extract_component_from_datetime(t, op, extract_fn=F.hour, **kwargs)
+    return compile_extract_component
 
 
-@compiles(ops.ExtractMinute)
-def compile_extract_minute(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.minute, **kwargs
-    )
-
+_datetime_component_functions = {
+    ops.ExtractYear: F.year,
+    ops.ExtractMonth: F.month,
+    ops.ExtractDay: F.dayofmonth,
+    ops.ExtractDayOfYear: F.dayofyear,
+    ops.ExtractQuarter: F.quarter,
+    ops.ExtractEpochSeconds: F.unix_timestamp,
+    ops.ExtractWeekOfYear: F.weekofyear,
+    ops.ExtractHour: F.hour,
+    ops.ExtractMinute: F.minute,
+    ops.ExtractSecond: F.second,
+}
 
-@compiles(ops.ExtractSecond)
-def compile_extract_second(t, op, **kwargs):
-    return _extract_component_from_datetime(
-        t, op, extract_fn=F.second, **kwargs
-    )
+for _klass, _fn in _datetime_component_functions.items():
+    compiles(_klass)(_compile_extract_component(_fn))
 
 
 @compiles(ops.ExtractMillisecond)
@@ -1388,15 +1576,68 @@ def compile_timestamp_truncate(t, op, **kwargs):
     return compile_date_truncate(t, op, **kwargs)
 
 
+# strftime directive to Spark datetime pattern
+_strftime_directives = {
+    '%a': 'EEE',
+    '%A': 'EEEE',
+    '%b': 'MMM',
+    '%B': 'MMMM',
+    '%d': 'dd',
+    '%f': 'SSSSSS',
+    '%H': 'HH',
+    '%I': 'hh',
+    '%j': 'DDD',
+    '%m': 'MM',
+    '%M': 'mm',
+    '%p': 'a',
+    '%S': 'ss',
+    '%y': 'yy',
+    '%Y': 'yyyy',
+}
+
+
+def _strftime_to_spark_pattern(format_str):
+    """Convert a strftime format string to a Spark datetime pattern.
+
+    Return None if `format_str` uses a directive without a Spark equivalent.
+    """
+    pattern = []
+    literal = []
+
+    def flush_literal():
+        if literal:
+            text = ''.join(literal).replace("'", "''")
+            pattern.append(f"'{text}'")
+            literal.clear()
+
+    for token in re.findall(r'%.?|[^%]+', format_str, flags=re.DOTALL):
+        if token == '%%':
+            literal.append('%')
+        elif token.startswith('%'):
+            try:
+                directive = _strftime_directives[token]
+            except KeyError:
+                return None
+            flush_literal()
+            pattern.append(directive)
+        else:
+            literal.append(token)
+    flush_literal()
+    return ''.join(pattern)
+
+
 @compiles(ops.Strftime)
 def compile_strftime(t, op, **kwargs):
     format_str = op.format_str.value
+    src_column = t.translate(op.arg, **kwargs)
+
+    if (pattern := _strftime_to_spark_pattern(format_str)) is not None:
+        return F.date_format(src_column, pattern)
 
     @pandas_udf('string', PandasUDFType.SCALAR)
     def strftime(timestamps):
         return timestamps.dt.strftime(format_str)
 
-    src_column = t.translate(op.arg, **kwargs)
     return strftime(src_column)
 
 
@@ -1436,22 +1677,15 @@ def compile_string_to_timestamp(t, op, **kwargs):
 
 @compiles(ops.DayOfWeekIndex)
 def compile_day_of_week_index(t, op, **kwargs):
-    @pandas_udf('short', PandasUDFType.SCALAR)
-    def day_of_week(s):
-        return s.dt.dayofweek
-
     src_column = t.translate(op.arg, **kwargs)
-    return day_of_week(src_column.cast('timestamp'))
+    # spark's dayofweek starts at 1 on Sunday, ibis' index at 0 on Monday
+    return ((F.dayofweek(src_column) + 5) % 7).cast('short')
 
 
 @compiles(ops.DayOfWeekName)
 def compiles_day_of_week_name(t, op, **kwargs):
-    @pandas_udf('string', PandasUDFType.SCALAR)
-    def day_name(s):
-        return s.dt.day_name()
-
     src_column = t.translate(op.arg, **kwargs)
-    return day_name(src_column.cast('timestamp'))
+    return F.date_format(src_column.cast('timestamp'), 'EEEE')
 
 
 def _get_interval_col(t, op, allowed_units=None, **kwargs):
@@ -1491,9 +1725,18 @@ def _get_interval_col(t, op, allowed_units=None, **kwargs):
                 'smallest unit supported by Spark is microseconds.'
             )
         td_micros = td_nanos // 1000
-        return F.expr(f'INTERVAL {td_micros} MICROSECOND')
+        return _interval_expr(t, td_micros, 'MICROSECOND')
     else:
-        return F.expr(f'INTERVAL {op.value} {_time_unit_mapping[dtype.unit]}')
+        return _interval_expr(t, op.value, _time_unit_mapping[dtype.unit])
+
+
+def _interval_expr(t, value, unit):
+    # Reuse the parsed interval column within a translation; columns are not
+    # cached globally since they are bound to the active Spark session
+    key = value, unit
+    if (result := t._interval_exprs.get(key)) is None:
+        result = t._interval_exprs[key] = F.expr(f'INTERVAL {value} {unit}')
+    return result
 
 
 def _compile_datetime_binop(t, op, *, fn, **kwargs):
@@ -1605,18 +1848,41 @@ def compile_array_length(t, op, **kwargs):
     return F.size(src_column)
 
 
+# F.slice only accepts columns for its start and length from pyspark 3.1
+_SLICE_ACCEPTS_COLUMNS = vparse(pyspark.__version__) >= vparse("3.1")
+
+
 @compiles(ops.ArraySlice)
 def compile_array_slice(t, op, **kwargs):
-    start = op.start.value if op.start is not None else op.start
+    start = op.start.value
     stop = op.stop.value if op.stop is not None else op.stop
-    spark_type = ibis_array_dtype_to_spark_dtype(op.arg.output_dtype)
+    src_column = t.translate(op.arg, **kwargs)
 
-    @F.udf(spark_type)
-    def array_slice(array):
-        return array[start:stop]
+    if start >= 0 and stop is not None and stop >= 0:
+        return F.slice(src_column, start + 1, max(stop - start, 0))
 
-    src_column = t.translate(op.arg, **kwargs)
-    return array_slice(src_column)
+    if not _SLICE_ACCEPTS_COLUMNS:
+        spark_type = ibis_array_dtype_to_spark_dtype(op.arg.output_dtype)
+
+        @F.udf(spark_type)
+        def array_slice(array):
+            return array[start:stop]
+
+        return array_slice(src_column)
+
+    # Negative or missing bounds depend on the size of each array, clamp them
+    # the same way python's slicing does
+    size = F.size(src_column)
+
+    def clamp(index):
+        if index < 0:
+            return F.greatest(size + index, F.lit(0))
+        return F.least(F.lit(index), size)
+
+    start_column = clamp(start)
+    stop_column = size if stop is None else clamp(stop)
+    length = F.greatest(stop_column - start_column, F.lit(0))
+    return F.slice(src_column, start_column + 1, length)
 
 
 @compiles(ops.ArrayIndex)
@@ -1636,7 +1902,7 @@ def compile_array_concat(t, op, **kwargs):
 @compiles(ops.ArrayRepeat)
 def compile_array_repeat(t, op, **kwargs):
     src_column = t.translate(op.arg, **kwargs)
-    times = op.times.value
+    times = _literal_int(op.times, 'times')
     return F.flatten(F.array_repeat(src_column, times))
 
 
@@ -1654,11 +1920,31 @@ def compile_null_literal(t, op, **kwargs):
     return F.lit(None)
 
 
+def _is_null_or_nan(col, dtype):
+    """Return a null check for `col`, also matching NaN for float columns."""
+    if isinstance(dtype, dt.Floating):
+        return F.isnull(col) | F.isnan(col)
+    return F.isnull(col)
+
+
 @compiles(ops.IfNull)
 def compile_if_null(t, op, **kwargs):
+    # A chain of IfNull(IfNull(a, b), c) picks the first non-null of a, b
+    # and c, so unless NaN has to be treated as null it is a single coalesce
+    args = [op.ifnull_expr]
+    arg = op.arg
+    while isinstance(arg, ops.IfNull):
+        args.append(arg.ifnull_expr)
+        arg = arg.arg
+    args.append(arg)
+    if not any(isinstance(arg.output_dtype, dt.Floating) for arg in args):
+        return F.coalesce(*(t.translate(arg, **kwargs) for arg in args[::-1]))
+
     col = t.translate(op.arg, **kwargs)
     ifnull_col = t.translate(op.ifnull_expr, **kwargs)
-    return F.when(col.isNull() | F.isnan(col), ifnull_col).otherwise(col)
+    return F.when(
+        _is_null_or_nan(col, op.arg.output_dtype), ifnull_col
+    ).otherwise(col)
 
 
 @compiles(ops.NullIf)
@@ -1671,13 +1957,13 @@ def compile_null_if(t, op, **kwargs):
 @compiles(ops.IsNull)
 def compile_is_null(t, op, **kwargs):
     col = t.translate(op.arg, **kwargs)
-    return F.isnull(col) | F.isnan(col)
+    return _is_null_or_nan(col, op.arg.output_dtype)
 
 
 @compiles(ops.NotNull)
 def compile_not_null(t, op, **kwargs):
     col = t.translate(op.arg, **kwargs)
-    return ~F.isnull(col) & ~F.isnan(col)
+    return ~_is_null_or_nan(col, op.arg.output_dtype)
 
 
 @compiles(ops.DropNa)
@@ -1728,12 +2014,67 @@ def compile_reduction_udf(t, op, *, aggcontext=None, **kwargs):
     if aggcontext:
         return col
     else:
+        # The table was already translated while compiling the column
+        # arguments above, so this is a scope lookup rather than a second
+        # compilation of the table subtree
         src_table = t.translate(op.func_args[0].table, **kwargs)
         return src_table.agg(col)
 
 
+# Minimum number of branches before a case expression that only compares
+# one value against literals is compiled to a map lookup
+_CASE_LOOKUP_MIN_BRANCHES = 8
+
+
+def _case_lookup_table(op):
+    """Return ``(value, [(key, result), ...])`` if `op` is a lookup.
+
+    A searched case is a lookup when every case compares the same value
+    with an integer or string literal and every result is a non-null
+    literal.
+    """
+    if len(op.cases) < _CASE_LOOKUP_MIN_BRANCHES:
+        return None
+
+    value = None
+    table = {}
+    for case, result in zip(op.cases.values, op.results.values):
+        if not (
+            isinstance(case, ops.Equals)
+            and isinstance(case.right, ops.Literal)
+            and isinstance(case.right.output_dtype, (dt.Integer, dt.String))
+            and case.right.value is not None
+            and isinstance(result, ops.Literal)
+            and result.value is not None
+        ):
+            return None
+        if value is None:
+            value = case.left
+        elif case.left != value:
+            return None
+        # the first matching branch wins; Spark rejects duplicate map keys
+        table.setdefault(case.right.value, (case.right, result))
+    return value, table.values()
+
+
 @compiles(ops.SearchedCase)
 def compile_searched_case(t, op, **kwargs):
+    lookup = _case_lookup_table(op)
+    if lookup is not None:
+        value, pairs = lookup
+        mapping = F.create_map(
+            *(
+                t.translate(literal, **kwargs)
+                for pair in pairs
+                for literal in pair
+            )
+        )
+        # unlike element_at, a missing key gives null even in ANSI mode
+        return F.coalesce(
+            mapping[t.translate(value, **kwargs)],
+            t.translate(op.default, **kwargs),
+        )
+
     existing_when = None
 
     for case, result in zip(op.cases.values, op.results.values):
@@ -1755,10 +2096,15 @@ def compile_searched_case(t, op, **kwargs):
 def compile_view(t, op, **kwargs):
     name = op.name
     child = op.child
-    # TODO(kszucs): avoid converting to expr
-    backend = child.to_expr()._find_backend()
-    tables = backend._session.catalog.listTables()
-    if any(name == table.name and not table.isTemporary for table in tables):
+    if t._persistent_tables is None:
+        # TODO(kszucs): avoid converting to expr
+        backend = child.to_expr()._find_backend()
+        t._persistent_tables = frozenset(
+            table.name
+            for table in backend._session.catalog.listTables()
+            if not table.isTemporary
+        )
+    if name in t._persistent_tables:
         raise ValueError(
             f"table or non-temporary view `{name}` already exists"
         )
@@ -1795,19 +2141,6 @@ def compile_null_if_zero(t, op, **kwargs):
     return F.when(arg == 0, F.lit(None)).otherwise(arg)
 
 
-@compiles(ops.Acos)
-@compiles(ops.Asin)
-@compiles(ops.Atan)
-@compiles(ops.Cos)
-@compiles(ops.Sin)
-@compiles(ops.Tan)
-def compile_trig(t, op, **kwargs):
-    arg = t.translate(op.arg, **kwargs)
-    func_name = op.__class__.__name__.lower()
-    func = getattr(F, func_name)
-    return func(arg)
-
-
 @compiles(ops.Cot)
 def compile_cot(t, op, **kwargs):
     arg = t.translate(op.arg, **kwargs)
@@ -1833,15 +2166,23 @@ def compile_radians(t, op, **kwargs):
 @compiles(ops.ZeroIfNull)
 def compile_zero_if_null(t, op, **kwargs):
     col = t.translate(op.arg, **kwargs)
-    return F.when(col.isNull() | F.isnan(col), F.lit(0)).otherwise(col)
+    return F.when(
+        _is_null_or_nan(col, op.arg.output_dtype), F.lit(0)
+    ).otherwise(col)
 
 
 @compiles(ops.Where)
 def compile_where(t, op, **kwargs):
-    return F.when(
-        t.translate(op.bool_expr, **kwargs),
-        t.translate(op.true_expr, **kwargs),
-    ).otherwise(t.translate(op.false_null_expr, **kwargs))
+    # Build nested ifelse calls as a single CASE WHEN with several branches
+    when = F.when
+    while isinstance(op, ops.Where):
+        result = when(
+            t.translate(op.bool_expr, **kwargs),
+            t.translate(op.true_expr, **kwargs),
+        )
+        when = result.when
+        op = op.false_null_expr
+    return result.otherwise(t.translate(op, **kwargs))
 
 
 @compiles(ops.RandomScalar)
@@ -1849,15 +2190,51 @@ def compile_random(*args, **kwargs):
     return F.rand()
 
 
-@compiles(ops.InMemoryTable)
-@compiles(PandasInMemoryTable)
+# Types whose pandas columns convert to Spark through Arrow without falling
+# back, which would emit a warning
+_ARROW_CONVERTIBLE_DTYPES = dt.Boolean, dt.Integer, dt.Floating, dt.String
+_ARROW_ENABLED = 'spark.sql.execution.arrow.pyspark.enabled'
+_ARROW_FALLBACK_ENABLED = 'spark.sql.execution.arrow.pyspark.fallback.enabled'
+
+
+@contextlib.contextmanager
+def _arrow_conversion(session):
+    """Convert pandas data with Arrow instead of row by row.
+
+    Arrow is only turned on when Spark is allowed to fall back to the row
+    based conversion for types Arrow can't handle, and the previous setting
+    is restored afterwards.
+    """
+    conf = session.conf
+    previous = conf.get(_ARROW_ENABLED, 'false')
+    enabled = previous.lower() == 'true'
+    can_fall_back = conf.get(_ARROW_FALLBACK_ENABLED, 'true').lower() == 'true'
+    if enabled or not can_fall_back:
+        yield
+        return
+
+    conf.set(_ARROW_ENABLED, 'true')
+    try:
+        yield
+    finally:
+        conf.set(_ARROW_ENABLED, previous)
+
+
+@compiles(ops.InMemoryTable, PandasInMemoryTable)
 def compile_in_memory_table(t, op, session, **kwargs):
     fields = [
         pt.StructField(name, ibis_dtype_to_spark_dtype(dtype), dtype.nullable)
         for name, dtype in op.schema.items()
     ]
     schema = pt.StructType(fields)
-    return session.createDataFrame(data=op.data.to_frame(), schema=schema)
+    data = op.data.to_frame()
+    if not all(
+        isinstance(dtype, _ARROW_CONVERTIBLE_DTYPES)
+        for dtype in op.schema.types
+    ):
+        return session.createDataFrame(data=data, schema=schema)
+    with _arrow_conversion(session):
+        return session.createDataFrame(data=data, schema=schema)
 
 
 @compiles(ops.BitwiseAnd)
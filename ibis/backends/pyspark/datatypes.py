@@ -97,6 +97,7 @@ def from_spark_dtype(value: pt.DataType) -> pt.DataType:
 
 
 @spark_dtype.register(dt.DataType)
+@functools.lru_cache(maxsize=None)
 def ibis_dtype_to_spark_dtype(ibis_dtype_obj):
     """Convert ibis types types to Spark SQL."""
     return _IBIS_DTYPE_TO_SPARK_DTYPE.get(type(ibis_dtype_obj))()
@@ -110,6 +111,7 @@ def ibis_decimal_dtype_to_spark_dtype(ibis_dtype_obj):
 
 
 @spark_dtype.register(dt.Array)
+@functools.lru_cache(maxsize=None)
 def ibis_array_dtype_to_spark_dtype(ibis_dtype_obj):
     element_type = spark_dtype(ibis_dtype_obj.value_type)
     contains_null = ibis_dtype_obj.value_type.nullable
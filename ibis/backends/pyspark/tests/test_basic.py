@@ -11,6 +11,9 @@ import pyspark.sql.functions as F  # noqa: E402
 
 from ibis.backends.pyspark.compiler import (  # noqa: E402
     _can_be_replaced_by_column_name,
+    _canonicalize_interval,
+    _strftime_to_spark_pattern,
+    _union_is_distinct,
 )
 
 
@@ -51,6 +54,30 @@ def test_projection(client):
     tm.assert_frame_equal(result2, expected2)
 
 
+def test_cache_compiled(client):
+    table = client.table('basic_table')
+    expr = table.mutate(v=table['id'] * 2)
+
+    with ibis.config.option_context('pyspark.cache_compiled', True):
+        assert client.compile(expr) is client.compile(expr)
+
+    assert client.compile(expr) is not client.compile(expr)
+
+
+def test_cache_compiled_respects_treat_nan_as_null(client):
+    table = client.table('basic_table')
+    expr = table.mutate(v=table['id'] / 2.0)
+
+    with ibis.config.option_context('pyspark.cache_compiled', True):
+        default = client.compile(expr)
+        with ibis.config.option_context('pyspark.treat_nan_as_null', True):
+            nan_as_null = client.compile(expr)
+            assert client.compile(expr) is nan_as_null
+        assert client.compile(expr) is default
+
+    assert nan_as_null is not default
+
+
 def test_aggregation_col(client):
     table = client.table('basic_table')
     result = table['id'].count().execute()
@@ -217,3 +244,142 @@ def test_can_be_replaced_by_column_name(selection_fn, selection_idx, expected):
         selection_to_test, table.op().table
     )
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    ('left_pred', 'right_pred', 'expected'),
+    [
+        param(lambda t: t.id < 5, lambda t: t.id >= 5, True, id='lt_ge'),
+        param(lambda t: t.id > 5, lambda t: t.id <= 5, True, id='gt_le'),
+        param(lambda t: t.id == 5, lambda t: t.id != 5, True, id='eq_ne'),
+        param(lambda t: t.id < 5, lambda t: t.id >= 4, False, id='overlap'),
+        param(
+            lambda t: t.id < 5,
+            lambda t: t.str_col == 'a',
+            False,
+            id='other_column',
+        ),
+    ],
+)
+def test_union_is_distinct(left_pred, right_pred, expected):
+    table = ibis.table([('id', 'int64'), ('str_col', 'string')]).distinct()
+    left = table.filter(left_pred(table))
+    right = table.filter(right_pred(table))
+    expr = left.union(right, distinct=True)
+    assert _union_is_distinct(expr.op()) == expected
+
+
+def test_union_is_distinct_requires_distinct_inputs():
+    table = ibis.table([('id', 'int64'), ('str_col', 'string')])
+    left = table.filter(table.id < 5)
+    right = table.filter(table.id >= 5)
+    expr = left.union(right, distinct=True)
+    assert not _union_is_distinct(expr.op())
+
+
+@pytest.mark.parametrize(
+    ('format_str', 'expected'),
+    [
+        ('%Y%m%d', 'yyyyMMdd'),
+        ('%Y-%m-%d %H:%M:%S', "yyyy'-'MM'-'dd' 'HH':'mm':'ss"),
+        ("%H o'clock", "HH' o''clock'"),
+        ('100%%', "'100%'"),
+        ('%Z', None),
+    ],
+)
+def test_strftime_to_spark_pattern(format_str, expected):
+    assert _strftime_to_spark_pattern(format_str) == expected
+
+
+@pytest.mark.parametrize('how', ['inner', 'left', 'semi', 'anti'])
+def test_join_with_constant_filter(client, how):
+    table = client.table('basic_table')
+    left = table.filter(table.id == 3)
+    expr = left.join(table, ['id', 'str_col'], how=how)[
+        left.id, left.str_col
+    ]
+    result = expr.compile().toPandas()
+
+    expected_ids = [] if how == 'anti' else [3]
+    assert result['id'].tolist() == expected_ids
+
+
+def test_searched_case_lookup(client):
+    table = client.table('basic_table')
+    case = ibis.case()
+    for i in range(8):
+        case = case.when(table.id == i, f'id_{i}')
+    # a repeated key must keep the result of its first branch
+    case = case.when(table.id == 0, 'unreachable')
+    expr = table.mutate(label=case.else_('other').end())
+    result = expr.compile().toPandas()
+
+    expected = [f'id_{i}' for i in range(8)] + ['other', 'other']
+    assert result['label'].tolist() == expected
+
+
+def test_searched_case_lookup_default_with_ansi(client):
+    session = client._session
+    previous = session.conf.get('spark.sql.ansi.enabled')
+    session.conf.set('spark.sql.ansi.enabled', 'true')
+    try:
+        table = client.table('basic_table')
+        case = ibis.case()
+        for i in range(8):
+            case = case.when(table.id == i, f'id_{i}')
+        expr = table.mutate(label=case.else_('other').end())
+        result = expr.compile().toPandas()
+    finally:
+        session.conf.set('spark.sql.ansi.enabled', previous)
+
+    # ids 8 and 9 are missing from the lookup map and fall to the default
+    expected = [f'id_{i}' for i in range(8)] + ['other', 'other']
+    assert result['label'].tolist() == expected
+
+
+def test_string_ops_with_column_arguments(client):
+    table = client.table('basic_table')
+    sep = table.str_col.substr(0, 1)
+    expr = table.select(
+        pos=table.str_col.find(table.str_col.substr(1, 2)),
+        joined=sep.join([table.str_col, table.str_col]),
+    )
+    result = expr.compile().toPandas()
+
+    assert result['pos'].tolist() == [1] * 10
+    assert result['joined'].tolist() == ['valuevvalue'] * 10
+
+
+@pytest.mark.parametrize(
+    ('substr', 'start', 'end'),
+    [
+        param('a', None, None, id='no_bounds'),
+        param('a', 2, None, id='start_past_match'),
+        param('u', 1, 3, id='end_before_match'),
+        param('l', 1, 4, id='within_bounds'),
+        param('u', -2, None, id='negative_start'),
+        param('a', -10, None, id='negative_start_before_beginning'),
+        param('l', None, -1, id='negative_end'),
+        param('u', None, -2, id='negative_end_before_match'),
+        param('l', -4, -1, id='negative_start_and_end'),
+    ],
+)
+def test_string_find(client, substr, start, end):
+    table = client.table('basic_table')
+    expr = table.select(pos=table.str_col.find(substr, start, end))
+    result = expr.compile().toPandas()
+
+    assert result['pos'].tolist() == ['value'.find(substr, start, end)] * 10
+
+
+@pytest.mark.parametrize(
+    ('interval', 'expected'),
+    [
+        param(ibis.interval(seconds=3), 3, id='seconds'),
+        param(ibis.interval(milliseconds=1500), 1, id='positive_subsecond'),
+        param(ibis.interval(milliseconds=-1500), -1, id='negative_subsecond'),
+        param(ibis.interval(days=-1), -86400, id='negative_days'),
+    ],
+)
+def test_canonicalize_interval(interval, expected):
+    assert _canonicalize_interval(None, interval) == expected
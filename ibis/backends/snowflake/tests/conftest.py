@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import concurrent.futures
 import functools
 import os
 from pathlib import Path
@@ -16,6 +17,15 @@ if TYPE_CHECKING:
     from ibis.backends.base import BaseBackend
 
 
+def _load_table(eng, data_dir: Path, stage: str, table: str) -> None:
+    src = data_dir / f"{table}.csv"
+    with eng.connect() as con:
+        con.execute(f"PUT file://{str(src.absolute())} @{stage}/{table}.csv")
+        con.execute(
+            f"COPY INTO {table} FROM @{stage}/{table}.csv FILE_FORMAT = (FORMAT_NAME = ibis_csv_fmt)"  # noqa: E501
+        )
+
+
 class TestConf(BackendTest, RoundAwayFromZero):
     def __init__(self, data_directory: Path) -> None:
         self.connection = self.connect(data_directory)
@@ -60,14 +70,15 @@ CREATE OR REPLACE STAGE ibis_testing_stage
             for stmt in filter(None, map(str.strip, schema.split(';'))):
                 con.execute(stmt)
 
-            for table in TEST_TABLES:
-                src = data_dir / f"{table}.csv"
-                con.execute(
-                    f"PUT file://{str(src.absolute())} @{stage}/{table}.csv"
-                )
-                con.execute(
-                    f"COPY INTO {table} FROM @{stage}/{table}.csv FILE_FORMAT = (FORMAT_NAME = ibis_csv_fmt)"  # noqa: E501
-                )
+        # upload and copy every table concurrently, each on its own connection
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=int(os.environ.get("IBIS_DATA_MAX_WORKERS", 8))
+        ) as executor:
+            for future in concurrent.futures.as_completed(
+                executor.submit(_load_table, eng, data_dir, stage, table)
+                for table in TEST_TABLES
+            ):
+                future.result()
 
     @staticmethod
     @functools.lru_cache(maxsize=None)
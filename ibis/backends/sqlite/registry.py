@@ -1,11 +1,9 @@
+import datetime
 import functools
-import operator
+import sqlite3
 
 import sqlalchemy as sa
-import toolz
-from multipledispatch import Dispatcher
 
-import ibis
 import ibis.common.exceptions as com
 import ibis.expr.datatypes as dt
 import ibis.expr.operations as ops
@@ -25,93 +23,134 @@ operation_registry = sqlalchemy_operation_registry.copy()
 operation_registry.update(sqlalchemy_window_functions_registry)
 
 
-sqlite_cast = Dispatcher("sqlite_cast")
+# SQL functions used by the translators, looked up once
+_sql_date = sa.func.date
+_sql_datetime = sa.func.datetime
+_sql_julianday = sa.func.julianday
+_sql_length = sa.func.length
+_sql_printf = sa.func.printf
+_sql_quote = sa.func.quote
+_sql_replace = sa.func.replace
+_sql_strftime = sa.func.strftime
+_sql_substr = sa.func.substr
+_sql_time = sa.func.time
+_sql_unixepoch = sa.func.unixepoch
+_sql_zeroblob = sa.func.zeroblob
 
 
-@sqlite_cast.register(object, dt.Integer, dt.Timestamp)
 def _unixepoch(arg, from_, to):
-    return sa.func.datetime(arg, "unixepoch")
+    return _sql_datetime(arg, "unixepoch")
 
 
-@sqlite_cast.register(object, dt.String, dt.Timestamp)
 def _string_to_timestamp(arg, from_, to):
-    return sa.func.strftime('%Y-%m-%d %H:%M:%f', arg)
+    return _sql_strftime('%Y-%m-%d %H:%M:%f', arg)
 
 
-@sqlite_cast.register(object, dt.Integer, dt.Date)
 def _integer_to_date(arg, from_, to):
-    return sa.func.date(sa.func.datetime(arg, "unixepoch"))
+    return _sql_date(_sql_datetime(arg, "unixepoch"))
 
 
-@sqlite_cast.register(object, (dt.String, dt.Timestamp), dt.Date)
 def _string_or_timestamp_to_date(arg, from_, to):
-    return sa.func.date(arg)
+    return _sql_date(arg)
 
 
-@sqlite_cast.register(object, dt.DataType, (dt.Date, dt.Timestamp))
 def _value_to_temporal(arg, from_, to):
     raise com.UnsupportedOperationError(type(arg))
 
 
-@sqlite_cast.register(object, dt.Category, dt.Int32)
 def _category_to_int(arg, from_, to):
     return arg
 
 
-@sqlite_cast.register(object, dt.DataType, dt.DataType)
+# the SQLAlchemy type only depends on the (hashable) ibis type
+_to_sqla_type = functools.lru_cache(maxsize=None)(to_sqla_type)
+
+
 def _default_cast_impl(arg, from_, to):
-    return sa.cast(arg, to_sqla_type(to))
+    return sa.cast(arg, _to_sqla_type(to))
+
+
+# Cast implementations keyed by (source type, target type) datatype classes
+_cast_implementations = {
+    (dt.Integer, dt.Timestamp): _unixepoch,
+    (dt.String, dt.Timestamp): _string_to_timestamp,
+    (dt.Integer, dt.Date): _integer_to_date,
+    (dt.String, dt.Date): _string_or_timestamp_to_date,
+    (dt.Timestamp, dt.Date): _string_or_timestamp_to_date,
+    (dt.DataType, dt.Date): _value_to_temporal,
+    (dt.DataType, dt.Timestamp): _value_to_temporal,
+    (dt.Category, dt.Int32): _category_to_int,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_cast(from_type, to_type):
+    """Return the cast implementation for a pair of datatype classes.
+
+    The most specific source class wins, then the most specific target
+    class. Resolution only depends on the classes, so it is done once per
+    pair.
+    """
+    for from_cls in from_type.__mro__:
+        for to_cls in to_type.__mro__:
+            impl = _cast_implementations.get((from_cls, to_cls))
+            if impl is not None:
+                return impl
+    return _default_cast_impl
+
+
+def sqlite_cast(arg, from_, to):
+    return _resolve_cast(type(from_), type(to))(arg, from_, to)
 
 
 # TODO(kszucs): don't dispatch on op.arg since that should be always an
 # instance of ops.Value
 def _cast(t, op):
     arg = t.translate(op.arg)
+    from_ = op.arg.output_dtype
 
-    return sqlite_cast(arg, op.arg.output_dtype, op.to)
+    if from_.equals(op.to):
+        return arg
+    return sqlite_cast(arg, from_, op.to)
 
 
 def _string_right(t, op):
-    f = sa.func.substr
-
     sa_arg = t.translate(op.arg)
     sa_length = t.translate(op.nchars)
 
-    return f(sa_arg, -sa_length, sa_length)
+    return _sql_substr(sa_arg, -sa_length, sa_length)
 
 
 def _strftime(t, op):
     sa_arg = t.translate(op.arg)
     sa_format = t.translate(op.format_str)
-    return sa.func.strftime(sa_format, sa_arg)
+    return _sql_strftime(sa_format, sa_arg)
 
 
 def _strftime_int(fmt):
     def translator(t, op):
-        # TODO(kszucs): avoid expr roundtrip, should be done in rewrite phase
-        new_expr = op.arg.to_expr().strftime(fmt).cast(dt.int32)
-        return t.translate(new_expr.op())
+        return sa.cast(_sql_strftime(fmt, t.translate(op.arg)), sa.Integer)
 
     return translator
 
 
 def _extract_quarter(t, op):
-    expr_new = ops.ExtractMonth(op.arg).to_expr()
-    expr_new = (
-        ibis.case()
-        .when(expr_new.isin([1, 2, 3]), 1)
-        .when(expr_new.isin([4, 5, 6]), 2)
-        .when(expr_new.isin([7, 8, 9]), 3)
-        .else_(4)
-        .end()
-    )
-    return sa.cast(t.translate(expr_new.op()), sa.Integer)
+    month = sa.cast(_sql_strftime('%m', t.translate(op.arg)), sa.Integer)
+    # integer division maps months 1-3 to 1, 4-6 to 2 and so on
+    return (month + 2) / 3
+
 
+if sqlite3.sqlite_version_info >= (3, 38, 0):
 
-def _extract_epoch_seconds(t, op):
-    # example: (julianday('now') - 2440587.5) * 86400.0
-    sa_expr = (sa.func.julianday(t.translate(op.arg)) - 2440587.5) * 86400.0
-    return sa.cast(sa_expr, sa.BigInteger)
+    def _extract_epoch_seconds(t, op):
+        return _sql_unixepoch(t.translate(op.arg), type_=sa.BigInteger)
+
+else:
+
+    def _extract_epoch_seconds(t, op):
+        # example: (julianday('now') - 2440587.5) * 86400.0
+        sa_expr = (_sql_julianday(t.translate(op.arg)) - 2440587.5) * 86400.0
+        return sa.cast(sa_expr, sa.BigInteger)
 
 
 _truncate_modifiers = {
@@ -124,22 +163,21 @@ _truncate_modifiers = {
 
 def _truncate(func):
     def translator(t, op):
-        sa_arg = t.translate(op.arg)
-        try:
-            modifier = _truncate_modifiers[op.unit]
-        except KeyError:
+        if (modifier := _truncate_modifiers.get(op.unit)) is None:
             raise com.UnsupportedOperationError(
                 f'Unsupported truncate unit {op.unit!r}'
             )
-        return func(sa_arg, modifier)
+        return func(t.translate(op.arg), modifier)
 
     return translator
 
 
 def _millisecond(t, op):
     sa_arg = t.translate(op.arg)
-    fractional_second = sa.func.strftime('%f', sa_arg)
-    return (fractional_second * 1000) % 1000
+    # %f formats seconds as SS.SSS, so the milliseconds are the last three
+    # characters
+    fractional_second = _sql_strftime('%f', sa_arg)
+    return sa.cast(_sql_substr(fractional_second, 4, 3), sa.Integer)
 
 
 def _log(t, op):
@@ -149,43 +187,47 @@ def _log(t, op):
     return sa.func._ibis_sqlite_log(sa_arg, t.translate(op.base))
 
 
-def _repeat(t, op):
-    arg = t.translate(op.arg)
-    times = t.translate(op.times)
-    f = sa.func
-    return f.replace(
-        f.substr(f.quote(f.zeroblob((times + 1) / 2)), 3, times), '0', arg
-    )
-
-
 def _generic_pad(arg, length, pad):
-    f = sa.func
-    arg_length = f.length(arg)
-    pad_length = f.length(pad)
+    arg_length = _sql_length(arg)
+    pad_length = _sql_length(pad)
     number_of_zero_bytes = (
         (length - arg_length - 1 + pad_length) / pad_length + 1
     ) / 2
-    return f.substr(
-        f.replace(
-            f.replace(
-                f.substr(f.quote(f.zeroblob(number_of_zero_bytes)), 3), "'", ''
-            ),
-            '0',
-            pad,
-        ),
+    blob_literal = _sql_quote(_sql_zeroblob(number_of_zero_bytes))
+    zeros = _sql_replace(_sql_substr(blob_literal, 3), "'", '')
+    return _sql_substr(
+        _sql_replace(zeros, '0', pad),
         1,
-        length - f.length(arg),
+        length - _sql_length(arg),
     )
 
 
+def _pad(t, op, arg):
+    length, pad = op.length, op.pad
+    if (
+        isinstance(length, ops.Literal)
+        and isinstance(pad, ops.Literal)
+        and length.value is not None
+        and pad.value
+    ):
+        # with a known length and pad the longest padding ever needed is a
+        # constant, so build it here and only cut it to size in SQL
+        n = max(length.value, 0)
+        padding = (pad.value * -(-n // len(pad.value)))[:n]
+        return _sql_substr(
+            sa.literal(padding), 1, length.value - _sql_length(arg)
+        )
+    return _generic_pad(arg, t.translate(length), t.translate(pad))
+
+
 def _lpad(t, op):
-    arg, length, pad = map(t.translate, op.args)
-    return _generic_pad(arg, length, pad) + arg
+    arg = t.translate(op.arg)
+    return _pad(t, op, arg) + arg
 
 
 def _rpad(t, op):
-    arg, length, pad = map(t.translate, op.args)
-    return arg + _generic_pad(arg, length, pad)
+    arg = t.translate(op.arg)
+    return arg + _pad(t, op, arg)
 
 
 def _extract_week_of_year(t, op):
@@ -230,17 +272,35 @@ def _extract_week_of_year(t, op):
     Here the ISO week of year is `1` since the day occurs in a week with more
     days in the week occuring in the _next_ week's year.
     """
-    date = sa.func.date(t.translate(op.arg), "-3 days", "weekday 4")
-    return (sa.func.strftime("%j", date) - 1) / 7 + 1
+    date = _sql_date(t.translate(op.arg), "-3 days", "weekday 4")
+    day_of_year = sa.cast(_sql_strftime("%j", date), sa.Integer)
+    return (day_of_year - 1) / 7 + 1
+
+
+def _concat(parts):
+    """Concatenate `parts` with ``||``.
+
+    The expression tree is built balanced rather than left-deep, so its
+    depth grows logarithmically with the number of parts. Concatenation is
+    associative, so the generated SQL needs no extra parentheses.
+    """
+    parts = list(parts)
+    while len(parts) > 1:
+        pairs = [
+            left.concat(right) for left, right in zip(parts[::2], parts[1::2])
+        ]
+        if len(parts) % 2:
+            pairs.append(parts[-1])
+        parts = pairs
+    (result,) = parts
+    return result
 
 
 def _string_join(t, op):
-    # TODO(kszucs): use explicit argument names instead
-    sep, elements = op.args
-    return functools.reduce(
-        operator.add,
-        toolz.interpose(t.translate(sep), map(t.translate, elements.values)),
-    )
+    values = op.arg.values
+    parts = [t.translate(op.sep)] * (2 * len(values) - 1)
+    parts[::2] = map(t.translate, values)
+    return _concat(parts)
 
 
 def _string_concat(t, op):
@@ -248,38 +308,92 @@ def _string_concat(t, op):
     #
     # `args` is always the list of values of the fields declared in the
     # operation
-    return functools.reduce(operator.add, map(t.translate, op.arg.values))
+    return _concat(map(t.translate, op.arg.values))
+
+
+def _temporal_literal(cls, *args):
+    """Return `cls(*args)` as a SQL string literal, or None.
+
+    The value is folded at compile time only if every argument is an integer
+    literal and they form a valid value. SQLite's date and time functions
+    return NULL for invalid values, so those still go through SQL.
+    """
+    if not all(
+        isinstance(arg, ops.Literal) and isinstance(arg.value, int)
+        for arg in args
+    ):
+        return None
+    try:
+        value = cls(*(arg.value for arg in args))
+    except (ValueError, OverflowError):
+        return None
+    # str() gives the same text as SQLite's date(), datetime() and time()
+    return sa.literal(str(value))
 
 
 def _date_from_ymd(t, op):
-    ymdstr = sa.func.printf(
+    literal = _temporal_literal(datetime.date, op.year, op.month, op.day)
+    if literal is not None:
+        return literal
+
+    ymdstr = _sql_printf(
         '%04d-%02d-%02d',
         t.translate(op.year),
         t.translate(op.month),
         t.translate(op.day),
     )
-    return sa.func.date(ymdstr)
+    return _sql_date(ymdstr)
 
 
 def _timestamp_from_ymdhms(t, op):
-    y, mo, d, h, m, s, *rest = (
-        t.translate(x) if x is not None else None for x in op.args
+    literal = _temporal_literal(
+        datetime.datetime,
+        op.year,
+        op.month,
+        op.day,
+        op.hours,
+        op.minutes,
+        op.seconds,
     )
-    tz = rest[0] if rest else ''
-    timestr = sa.func.printf(
-        '%04d-%02d-%02d %02d:%02d:%02d%s', y, mo, d, h, m, s, tz
+    if literal is not None:
+        return literal
+
+    timestr = _sql_printf(
+        '%04d-%02d-%02d %02d:%02d:%02d',
+        t.translate(op.year),
+        t.translate(op.month),
+        t.translate(op.day),
+        t.translate(op.hours),
+        t.translate(op.minutes),
+        t.translate(op.seconds),
     )
-    return sa.func.datetime(timestr)
+    return _sql_datetime(timestr)
 
 
 def _time_from_hms(t, op):
-    timestr = sa.func.printf(
+    literal = _temporal_literal(
+        datetime.time, op.hours, op.minutes, op.seconds
+    )
+    if literal is not None:
+        return literal
+
+    timestr = _sql_printf(
         '%02d:%02d:%02d',
         t.translate(op.hours),
         t.translate(op.minutes),
         t.translate(op.seconds),
     )
-    return sa.func.time(timestr)
+    return _sql_time(timestr)
+
+
+# clause elements are immutable, so a single rowid column can be shared
+_rowid = sa.literal_column('rowid')
+
+_variance = variance_reduction('_ibis_sqlite_var')
+
+
+def _standard_dev(t, op):
+    return sa.func._ibis_sqlite_sqrt(_variance(t, op))
 
 
 operation_registry.update(
@@ -293,12 +407,11 @@ operation_registry.update(
         ops.Least: varargs(sa.func.min),
         ops.Greatest: varargs(sa.func.max),
         ops.IfNull: fixed_arity(sa.func.ifnull, 2),
-        ops.DateFromYMD: _date_from_ymd,
         ops.TimeFromHMS: _time_from_hms,
         ops.TimestampFromYMDHMS: _timestamp_from_ymdhms,
-        ops.DateTruncate: _truncate(sa.func.date),
+        ops.DateTruncate: _truncate(_sql_date),
         ops.Date: unary(sa.func.date),
-        ops.TimestampTruncate: _truncate(sa.func.datetime),
+        ops.TimestampTruncate: _truncate(_sql_datetime),
         ops.Strftime: _strftime,
         ops.ExtractYear: _strftime_int('%Y'),
         ops.ExtractMonth: _strftime_int('%m'),
@@ -311,13 +424,13 @@ operation_registry.update(
         ops.ExtractMinute: _strftime_int('%M'),
         ops.ExtractSecond: _strftime_int('%S'),
         ops.ExtractMillisecond: _millisecond,
-        ops.TimestampNow: fixed_arity(lambda: sa.func.datetime("now"), 0),
+        ops.TimestampNow: fixed_arity(lambda: _sql_datetime("now"), 0),
         ops.RegexSearch: fixed_arity(sa.func._ibis_sqlite_regex_search, 2),
         ops.RegexReplace: fixed_arity(sa.func._ibis_sqlite_regex_replace, 3),
         ops.RegexExtract: fixed_arity(sa.func._ibis_sqlite_regex_extract, 3),
         ops.LPad: _lpad,
         ops.RPad: _rpad,
-        ops.Repeat: _repeat,
+        ops.Repeat: fixed_arity(sa.func._ibis_sqlite_repeat, 2),
         ops.Reverse: unary(sa.func._ibis_sqlite_reverse),
         ops.StringAscii: unary(sa.func._ibis_sqlite_string_ascii),
         ops.Capitalize: unary(sa.func._ibis_sqlite_capitalize),
@@ -334,11 +447,9 @@ operation_registry.update(
         ops.Sign: unary(sa.func._ibis_sqlite_sign),
         ops.FloorDivide: fixed_arity(sa.func._ibis_sqlite_floordiv, 2),
         ops.Modulus: fixed_arity(sa.func._ibis_sqlite_mod, 2),
-        ops.Variance: variance_reduction('_ibis_sqlite_var'),
-        ops.StandardDev: toolz.compose(
-            sa.func._ibis_sqlite_sqrt, variance_reduction('_ibis_sqlite_var')
-        ),
-        ops.RowID: lambda *_: sa.literal_column('rowid'),
+        ops.Variance: _variance,
+        ops.StandardDev: _standard_dev,
+        ops.RowID: lambda *_: _rowid,
         ops.Cot: unary(sa.func._ibis_sqlite_cot),
         ops.Cos: unary(sa.func._ibis_sqlite_cos),
         ops.Sin: unary(sa.func._ibis_sqlite_sin),
@@ -33,6 +33,10 @@ sa = pytest.importorskip("sqlalchemy")
             lambda t: t.string_col.cast(dt.float32),
             lambda at: sa.cast(at.c.string_col, sa.REAL),
         ),
+        (
+            lambda t: t.string_col.cast(dt.date),
+            lambda at: sa.func.date(at.c.string_col),
+        ),
     ],
 )
 def test_cast(alltypes, alltypes_sqla, translate, func, expected):
@@ -64,6 +68,23 @@ def test_timestamp_cast_noop(
     assert translate(result.op()) == sqla_compile(expected)
 
 
+@pytest.mark.parametrize(
+    ('expr', 'expected'),
+    [
+        (ibis.date(2022, 1, 2), "'2022-01-02'"),
+        (ibis.time(3, 4, 5), "'03:04:05'"),
+        (ibis.timestamp(2022, 1, 2, 3, 4, 5), "'2022-01-02 03:04:05'"),
+    ],
+)
+def test_temporal_from_literal_components(translate, expr, expected):
+    assert translate(expr.op()) == expected
+
+
+def test_invalid_date_from_literal_components(translate):
+    # SQLite decides what an invalid date becomes, so it isn't folded
+    assert 'printf' in translate(ibis.date(2022, 2, 30).op())
+
+
 def test_timestamp_functions(con):
     value = ibis.timestamp('2015-09-01 14:48:05.359')
     expr = value.strftime('%Y%m%d')
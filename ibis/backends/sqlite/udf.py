@@ -58,6 +58,11 @@ def _ibis_sqlite_capitalize(string):
     return string.capitalize()
 
 
+@udf
+def _ibis_sqlite_repeat(string, times):
+    return string * times
+
+
 @udf
 def _ibis_sqlite_translate(string, from_string, to_string):
     table = str.maketrans(from_string, to_string)
@@ -1,3 +1,5 @@
+import math
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -14,15 +16,38 @@ def mean_udf(s):
     return s.mean()
 
 
+@reduction(input_type=[dt.double], output_type=dt.double)
+def sum_udf(v):
+    return np.sum(v)
+
+
+@reduction(input_type=[dt.double], output_type=dt.Array(dt.double))
+def collect_udf(v):
+    return np.array(v)
+
+
+@reduction(
+    input_type=[dt.double],
+    output_type=dt.Struct(['mean', 'std'], [dt.double, dt.double]),
+)
+def mean_and_std(v):
+    return v.mean(), v.std()
+
+
+# Each param holds the ibis expression, the expected value of the ungrouped
+# aggregate and the expected values of the aggregate grouped by `key`; use
+# `ungrouped_params` and `grouped_params` to select the pair a test needs.
 aggregate_test_params = [
     param(
         lambda t: t.double_col.mean(),
         lambda t: t.double_col.mean(),
+        lambda t, key: t.groupby(key).double_col.mean(),
         id='mean',
     ),
     param(
         lambda t: mean_udf(t.double_col),
         lambda t: t.double_col.mean(),
+        lambda t, key: t.groupby(key).double_col.mean(),
         id='mean_udf',
         marks=[
             pytest.mark.notimpl(
@@ -41,21 +66,25 @@ aggregate_test_params = [
     param(
         lambda t: t.double_col.min(),
         lambda t: t.double_col.min(),
+        lambda t, key: t.groupby(key).double_col.min(),
         id='min',
     ),
     param(
         lambda t: t.double_col.max(),
         lambda t: t.double_col.max(),
+        lambda t, key: t.groupby(key).double_col.max(),
         id='max',
     ),
     param(
         lambda t: (t.double_col + 5).sum(),
         lambda t: (t.double_col + 5).sum(),
+        lambda t, key: (t.double_col + 5).groupby(t[key]).sum(),
         id='complex_sum',
     ),
     param(
         lambda t: t.timestamp_col.max(),
         lambda t: t.timestamp_col.max(),
+        lambda t, key: t.groupby(key).timestamp_col.max(),
         id='timestamp_max',
     ),
 ]
@@ -72,27 +101,52 @@ argidx_not_grouped_marks = [
 argidx_grouped_marks = ["dask"] + argidx_not_grouped_marks
 
 
+def grouped_argidx(t, key, col, by, how):
+    # `idxmin`/`idxmax` pick the first extremum in each group, which matches
+    # `argmin`/`argmax` on the ungrouped series
+    index = getattr(t.groupby(key)[by], how)()
+    return t[col].loc[index.values].set_axis(index.index)
+
+
 def make_argidx_params(marks):
     marks = pytest.mark.notyet(marks)
     return [
         param(
             lambda t: t.timestamp_col.argmin(t.int_col),
             lambda s: s.timestamp_col.iloc[s.int_col.argmin()],
+            lambda t, key: grouped_argidx(
+                t, key, 'timestamp_col', 'int_col', 'idxmin'
+            ),
             id='argmin',
             marks=marks,
         ),
         param(
             lambda t: t.double_col.argmax(t.int_col),
             lambda s: s.double_col.iloc[s.int_col.argmax()],
+            lambda t, key: grouped_argidx(
+                t, key, 'double_col', 'int_col', 'idxmax'
+            ),
             id='argmax',
             marks=marks,
         ),
     ]
 
 
+def ungrouped_params(params):
+    return [param(*p.values[:2], id=p.id, marks=p.marks) for p in params]
+
+
+def grouped_params(params):
+    return [
+        param(p.values[0], p.values[2], id=p.id, marks=p.marks) for p in params
+    ]
+
+
 @pytest.mark.parametrize(
     ('result_fn', 'expected_fn'),
-    aggregate_test_params + make_argidx_params(argidx_not_grouped_marks),
+    ungrouped_params(
+        aggregate_test_params + make_argidx_params(argidx_not_grouped_marks)
+    ),
 )
 def test_aggregate(backend, alltypes, df, result_fn, expected_fn):
     expr = alltypes.aggregate(tmp=result_fn)
@@ -107,7 +161,9 @@ def test_aggregate(backend, alltypes, df, result_fn, expected_fn):
 
 @pytest.mark.parametrize(
     ('result_fn', 'expected_fn'),
-    aggregate_test_params + make_argidx_params(argidx_grouped_marks),
+    grouped_params(
+        aggregate_test_params + make_argidx_params(argidx_grouped_marks)
+    ),
 )
 def test_aggregate_grouped(backend, alltypes, df, result_fn, expected_fn):
     grouping_key_col = 'bigint_col'
@@ -122,17 +178,14 @@ def test_aggregate_grouped(backend, alltypes, df, result_fn, expected_fn):
 
     # Note: Using `reset_index` to get the grouping key as a column
     expected = (
-        df.groupby(grouping_key_col)
-        .apply(expected_fn)
-        .rename('tmp')
-        .reset_index()
+        expected_fn(df, grouping_key_col).rename('tmp').reset_index()
     )
 
     # Row ordering may differ depending on backend, so sort on the
     # grouping key
-    result1 = result1.sort_values(by=grouping_key_col).reset_index(drop=True)
-    result2 = result2.sort_values(by=grouping_key_col).reset_index(drop=True)
-    expected = expected.sort_values(by=grouping_key_col).reset_index(drop=True)
+    result1 = result1.sort_values(by=grouping_key_col, ignore_index=True)
+    result2 = result2.sort_values(by=grouping_key_col, ignore_index=True)
+    expected = expected.sort_values(by=grouping_key_col, ignore_index=True)
 
     backend.assert_frame_equal(result1, expected)
     backend.assert_frame_equal(result2, expected)
@@ -153,14 +206,6 @@ def test_aggregate_grouped(backend, alltypes, df, result_fn, expected_fn):
 )
 def test_aggregate_multikey_group_reduction(backend, alltypes, df):
     """Tests .aggregate() on a multi-key groupby with a reduction operation."""
-
-    @reduction(
-        input_type=[dt.double],
-        output_type=dt.Struct(['mean', 'std'], [dt.double, dt.double]),
-    )
-    def mean_and_std(v):
-        return v.mean(), v.std()
-
     grouping_key_cols = ['bigint_col', 'int_col']
 
     expr1 = alltypes.groupby(grouping_key_cols).aggregate(
@@ -178,14 +223,68 @@ def test_aggregate_multikey_group_reduction(backend, alltypes, df):
 
     # Row ordering may differ depending on backend, so sort on the
     # grouping key
-    result1 = result1.sort_values(by=grouping_key_cols).reset_index(drop=True)
-    expected = expected.sort_values(by=grouping_key_cols).reset_index(
-        drop=True
-    )
+    result1 = result1.sort_values(by=grouping_key_cols, ignore_index=True)
+    expected = expected.sort_values(by=grouping_key_cols, ignore_index=True)
 
     backend.assert_frame_equal(result1, expected)
 
 
+def ibis_reduction(method, col='double_col', **kwargs):
+    return lambda t, where: getattr(t[col], method)(where=where, **kwargs)
+
+
+def pandas_reduction(method, col='double_col', **kwargs):
+    def reduce(t, where):
+        values = t[col][where].to_numpy()
+        # numpy reductions don't skip nulls the way pandas' do
+        assert not np.isnan(values).any()
+        return getattr(values, method)(**kwargs)
+
+    return reduce
+
+
+@pytest.fixture(
+    scope="module",
+    params=[
+        param((lambda _: None, lambda _: slice(None)), id='no_cond'),
+        param(
+            (
+                lambda t: t.string_col.isin(['1', '7']),
+                lambda t: t.string_col.isin(['1', '7']),
+            ),
+            id='is_in',
+        ),
+    ],
+)
+def reduction_cond(request, alltypes, df):
+    ibis_cond, pandas_cond = request.param
+    return ibis_cond(alltypes), pandas_cond(df)
+
+
+@pytest.fixture(
+    scope="module",
+    params=[
+        param((lambda _: None, lambda _: slice(None)), id='no_cond'),
+        param(
+            (
+                lambda t: t.yearID.isin([2009, 2015]),
+                lambda t: t.yearID.isin([2009, 2015]),
+            ),
+            id='cond',
+            marks=[
+                pytest.mark.broken(
+                    ["snowflake"],
+                    reason="snowflake doesn't allow quoted columns in groupby",
+                ),
+            ],
+        ),
+    ],
+)
+def batting_cond(request, batting, batting_df):
+    ibis_cond, pandas_cond = request.param
+    return ibis_cond(batting), pandas_cond(batting_df)
+
+
 @pytest.mark.parametrize(
     ('result_fn', 'expected_fn'),
     [
@@ -225,23 +324,23 @@ def test_aggregate_multikey_group_reduction(backend, alltypes, df):
             id='all_negate',
         ),
         param(
-            lambda t, where: t.double_col.sum(where=where),
-            lambda t, where: t.double_col[where].sum(),
+            ibis_reduction('sum'),
+            pandas_reduction('sum'),
             id='sum',
         ),
         param(
-            lambda t, where: t.double_col.mean(where=where),
-            lambda t, where: t.double_col[where].mean(),
+            ibis_reduction('mean'),
+            pandas_reduction('mean'),
             id='mean',
         ),
         param(
-            lambda t, where: t.double_col.min(where=where),
-            lambda t, where: t.double_col[where].min(),
+            ibis_reduction('min'),
+            pandas_reduction('min'),
             id='min',
         ),
         param(
-            lambda t, where: t.double_col.max(where=where),
-            lambda t, where: t.double_col[where].max(),
+            ibis_reduction('max'),
+            pandas_reduction('max'),
             id='max',
         ),
         param(
@@ -279,23 +378,23 @@ def test_aggregate_multikey_group_reduction(backend, alltypes, df):
             ),
         ),
         param(
-            lambda t, where: t.double_col.std(how='sample', where=where),
-            lambda t, where: t.double_col[where].std(ddof=1),
+            ibis_reduction('std', how='sample'),
+            pandas_reduction('std', ddof=1),
             id='std',
         ),
         param(
-            lambda t, where: t.double_col.var(how='sample', where=where),
-            lambda t, where: t.double_col[where].var(ddof=1),
+            ibis_reduction('var', how='sample'),
+            pandas_reduction('var', ddof=1),
             id='var',
         ),
         param(
-            lambda t, where: t.double_col.std(how='pop', where=where),
-            lambda t, where: t.double_col[where].std(ddof=0),
+            ibis_reduction('std', how='pop'),
+            pandas_reduction('std', ddof=0),
             id='std_pop',
         ),
         param(
-            lambda t, where: t.double_col.var(how='pop', where=where),
-            lambda t, where: t.double_col[where].var(ddof=0),
+            ibis_reduction('var', how='pop'),
+            pandas_reduction('var', ddof=0),
             id='var_pop',
         ),
         param(
@@ -341,7 +440,9 @@ def test_aggregate_multikey_group_reduction(backend, alltypes, df):
         ),
         param(
             lambda t, where: t.bigint_col.bit_and(where=where),
-            lambda t, where: np.bitwise_and.reduce(t.bigint_col[where].values),
+            lambda t, where: np.bitwise_and.reduce(
+                t.bigint_col[where].to_numpy(dtype=np.int64)
+            ),
             id='bit_and',
             marks=[
                 pytest.mark.notimpl(["dask", "snowflake"]),
@@ -350,7 +451,9 @@ def test_aggregate_multikey_group_reduction(backend, alltypes, df):
         ),
         param(
             lambda t, where: t.bigint_col.bit_or(where=where),
-            lambda t, where: np.bitwise_or.reduce(t.bigint_col[where].values),
+            lambda t, where: np.bitwise_or.reduce(
+                t.bigint_col[where].to_numpy(dtype=np.int64)
+            ),
             id='bit_or',
             marks=[
                 pytest.mark.notimpl(["dask", "snowflake"]),
@@ -359,7 +462,9 @@ def test_aggregate_multikey_group_reduction(backend, alltypes, df):
         ),
         param(
             lambda t, where: t.bigint_col.bit_xor(where=where),
-            lambda t, where: np.bitwise_xor.reduce(t.bigint_col[where].values),
+            lambda t, where: np.bitwise_xor.reduce(
+                t.bigint_col[where].to_numpy(dtype=np.int64)
+            ),
             id='bit_xor',
             marks=[
                 pytest.mark.notimpl(["dask", "snowflake"]),
@@ -373,31 +478,21 @@ def test_aggregate_multikey_group_reduction(backend, alltypes, df):
         ),
     ],
 )
-@pytest.mark.parametrize(
-    ('ibis_cond', 'pandas_cond'),
-    [
-        param(lambda _: None, lambda _: slice(None), id='no_cond'),
-        param(
-            lambda t: t.string_col.isin(['1', '7']),
-            lambda t: t.string_col.isin(['1', '7']),
-            id='is_in',
-        ),
-    ],
-)
 @mark.notimpl(["datafusion"])
-def test_reduction_ops(
-    alltypes,
-    df,
-    result_fn,
-    expected_fn,
-    ibis_cond,
-    pandas_cond,
-):
-    expr = result_fn(alltypes, ibis_cond(alltypes))
+def test_reduction_ops(alltypes, df, result_fn, expected_fn, reduction_cond):
+    ibis_cond, pandas_cond = reduction_cond
+    expr = result_fn(alltypes, ibis_cond)
     result = expr.execute()
 
-    expected = expected_fn(df, pandas_cond(df))
-    np.testing.assert_allclose(result, expected)
+    expected = expected_fn(df, pandas_cond)
+    if np.ndim(result) == 0 and np.ndim(expected) == 0:
+        # same tolerance and NaN handling as `assert_allclose`, without the
+        # array round trip
+        assert (math.isnan(result) and math.isnan(expected)) or math.isclose(
+            result, expected, rel_tol=1e-7
+        )
+    else:
+        np.testing.assert_allclose(result, expected)
 
 
 @pytest.mark.parametrize(
@@ -482,35 +577,12 @@ def test_reduction_ops(
         ),
     ],
 )
-@pytest.mark.parametrize(
-    ('ibis_cond', 'pandas_cond'),
-    [
-        param(lambda _: None, lambda _: slice(None), id='no_cond'),
-        param(
-            lambda t: t.yearID.isin([2009, 2015]),
-            lambda t: t.yearID.isin([2009, 2015]),
-            id='cond',
-            marks=[
-                pytest.mark.broken(
-                    ["snowflake"],
-                    reason="snowflake doesn't allow quoted columns in groupby",
-                ),
-            ],
-        ),
-    ],
-)
-def test_corr_cov(
-    batting,
-    batting_df,
-    result_fn,
-    expected_fn,
-    ibis_cond,
-    pandas_cond,
-):
-    expr = result_fn(batting, ibis_cond(batting))
+def test_corr_cov(batting, batting_df, result_fn, expected_fn, batting_cond):
+    ibis_cond, pandas_cond = batting_cond
+    expr = result_fn(batting, ibis_cond)
     result = expr.execute()
 
-    expected = expected_fn(batting_df, pandas_cond(batting_df))
+    expected = expected_fn(batting_df, pandas_cond)
 
     # Backends use different algorithms for computing covariance each with
     # different amounts of numerical stability.
@@ -537,6 +609,14 @@ def test_approx_median(alltypes):
     assert isinstance(result, float)
 
 
+def group_concat_expected(t, where, sep):
+    strings = t.string_col if isinstance(where, slice) else t.string_col[where]
+    strings = strings.dropna()
+    joined = strings.groupby(t.bigint_col.loc[strings.index]).agg(sep.join)
+    # groups without any non-null strings concatenate to null
+    return joined.reindex(t.bigint_col.drop_duplicates().sort_values())
+
+
 @mark.parametrize(
     ('result_fn', 'expected_fn'),
     [
@@ -549,19 +629,8 @@ def test_approx_median(alltypes):
                 .sort_by('bigint_col')
             ),
             lambda t, where, sep: (
-                (
-                    t
-                    if isinstance(where, slice)
-                    else t.assign(string_col=t.string_col.where(where))
-                )
-                .groupby('bigint_col')
-                .string_col.agg(
-                    lambda s: (
-                        np.nan if pd.isna(s).all() else sep.join(s.values)
-                    )
-                )
+                group_concat_expected(t, where, sep)
                 .rename('tmp')
-                .sort_index()
                 .reset_index()
             ),
             id='group_concat',
@@ -617,6 +686,16 @@ def test_group_concat(
     backend.assert_frame_equal(result, expected)
 
 
+@pytest.fixture(scope="module")
+def string_sorted_alltypes(alltypes):
+    return alltypes.sort_by(alltypes.string_col)
+
+
+@pytest.fixture(scope="module")
+def string_sorted_df(df):
+    return df.sort_values('string_col')
+
+
 @pytest.mark.parametrize(
     ('result_fn', 'expected_fn'),
     [
@@ -629,15 +708,15 @@ def test_group_concat(
 )
 @mark.notimpl(["pandas", "dask"])
 @pytest.mark.notyet(["pyspark", "datafusion"])
-def test_topk_op(alltypes, df, result_fn, expected_fn):
+def test_topk_op(
+    string_sorted_alltypes, string_sorted_df, result_fn, expected_fn
+):
     # TopK expression will order rows by "count" but each backend
     # can have different result for that.
     # Note: Maybe would be good if TopK could order by "count"
     # and the field used by TopK
-    t = alltypes.sort_by(alltypes.string_col)
-    df = df.sort_values('string_col')
-    result = result_fn(t).execute()
-    expected = expected_fn(df)
+    result = result_fn(string_sorted_alltypes).execute()
+    expected = expected_fn(string_sorted_df)
     assert all(result['count'].values == expected.values)
 
 
@@ -656,24 +735,30 @@ def test_topk_op(alltypes, df, result_fn, expected_fn):
     ],
 )
 @mark.notimpl(["datafusion", "pandas", "dask"])
-def test_topk_filter_op(alltypes, df, result_fn, expected_fn):
+def test_topk_filter_op(
+    string_sorted_alltypes, string_sorted_df, result_fn, expected_fn
+):
     # TopK expression will order rows by "count" but each backend
     # can have different result for that.
     # Note: Maybe would be good if TopK could order by "count"
     # and the field used by TopK
-    t = alltypes.sort_by(alltypes.string_col)
-    df = df.sort_values('string_col')
-    expr = result_fn(t)
+    expr = result_fn(string_sorted_alltypes)
     result = expr.execute()
-    expected = expected_fn(df)
+    expected = expected_fn(string_sorted_df)
     assert result.shape[0] == expected.shape[0]
 
 
+def list_like_reduction(agg_fn):
+    return reduction(input_type=[dt.double], output_type=dt.Array(dt.double))(
+        agg_fn
+    )
+
+
 @pytest.mark.parametrize(
-    'agg_fn',
+    'udf',
     [
-        param(lambda s: list(s), id='agg_to_list'),
-        param(lambda s: np.array(s), id='agg_to_ndarray'),
+        param(list_like_reduction(lambda s: list(s)), id='agg_to_list'),
+        param(list_like_reduction(lambda s: np.array(s)), id='agg_to_ndarray'),
     ],
 )
 @mark.notimpl(
@@ -688,23 +773,18 @@ def test_topk_filter_op(alltypes, df, result_fn, expected_fn):
         "snowflake",
     ]
 )
-def test_aggregate_list_like(backend, alltypes, df, agg_fn):
+def test_aggregate_list_like(backend, alltypes, df, udf):
     """Tests .aggregate() where the result of an aggregation is a list-like.
 
     We expect the list / np.array to be treated as a scalar (in other
     words, the resulting table expression should have one element, which
     is the list / np.array).
     """
-
-    udf = reduction(input_type=[dt.double], output_type=dt.Array(dt.double))(
-        agg_fn
-    )
-
     expr = alltypes.aggregate(result_col=udf(alltypes.double_col))
     result = expr.execute()
 
     # Expecting a 1-row DataFrame
-    expected = pd.DataFrame({'result_col': [agg_fn(df.double_col)]})
+    expected = pd.DataFrame({'result_col': [udf.func(df.double_col)]})
 
     backend.assert_frame_equal(result, expected)
 
@@ -727,15 +807,6 @@ def test_aggregate_mixed(backend, alltypes, df):
     (In particular, one aggregation that results in an array, and other
     aggregation(s) that result in a non-array)
     """
-
-    @reduction(input_type=[dt.double], output_type=dt.double)
-    def sum_udf(v):
-        return np.sum(v)
-
-    @reduction(input_type=[dt.double], output_type=dt.Array(dt.double))
-    def collect_udf(v):
-        return np.array(v)
-
     expr = alltypes.aggregate(
         sum_col=sum_udf(alltypes.double_col),
         collect_udf=collect_udf(alltypes.double_col),
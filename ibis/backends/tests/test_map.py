@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 import pytest
 
 import ibis
@@ -60,7 +61,7 @@ def test_map_scalar_contains_key_column(backend, alltypes, df):
     mapping = ibis.literal(value)
     expr = mapping.contains(alltypes.string_col).name('tmp')
     result = expr.execute()
-    expected = df.string_col.apply(lambda x: x in value).rename('tmp')
+    expected = df.string_col.isin(value).rename('tmp')
     backend.assert_series_equal(result, expected)
 
 
@@ -68,12 +69,10 @@ def test_map_column_contains_key_scalar(backend, alltypes, df):
     expr = ibis.map(
         ibis.array([alltypes.string_col]), ibis.array([alltypes.int_col])
     )
-    series = df.apply(lambda row: {row['string_col']: row['int_col']}, axis=1)
-
     result = expr.contains('1').name('tmp').execute()
-    series = series.apply(lambda x: '1' in x).rename('tmp')
+    expected = df.string_col.eq('1').rename('tmp')
 
-    backend.assert_series_equal(result, series)
+    backend.assert_series_equal(result, expected)
 
 
 def test_map_column_contains_key_column(backend, alltypes, df):
@@ -99,7 +98,7 @@ def test_literal_map_getitem_broadcast(backend, alltypes, df):
     expr = lookup_table[alltypes.string_col]
 
     result = expr.name('tmp').execute()
-    expected = df.string_col.apply(lambda x: value.get(x, None)).rename('tmp')
+    expected = df.string_col.map(value).rename('tmp')
 
     backend.assert_series_equal(result, expected)
 
@@ -111,9 +110,7 @@ def test_literal_map_get_broadcast(backend, alltypes, df):
     expr = lookup_table.get(alltypes.string_col, 'default')
 
     result = expr.name('tmp').execute()
-    expected = df.string_col.apply(lambda x: value.get(x, 'default')).rename(
-        'tmp'
-    )
+    expected = df.string_col.map(value).fillna('default').rename('tmp')
 
     backend.assert_series_equal(result, expected)
 
@@ -127,8 +124,13 @@ def test_map_construction(backend, con, alltypes, df):
         ibis.array([alltypes.string_col]), ibis.array([alltypes.int_col])
     )
     result = con.execute(expr)
-    expected = df.apply(
-        lambda row: {row['string_col']: row['int_col']}, axis=1
+    expected = pd.Series(
+        [
+            {key: value}
+            for key, value in zip(
+                df.string_col.to_numpy(), df.int_col.to_numpy()
+            )
+        ]
     )
 
     assert result.to_list() == expected.to_list()
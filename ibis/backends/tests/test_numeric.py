@@ -76,90 +76,89 @@ def test_isnan_isinf(
     if isinstance(expected, pd.Series):
         expected = backend.default_series_rename(expected)
         backend.assert_series_equal(result, expected)
+    elif np.ndim(result) == 0:
+        assert result == expected
     else:
-        try:
-            assert result == expected
-        except ValueError:
-            backend.assert_series_equal(result, expected)
+        backend.assert_series_equal(result, expected)
 
 
 @pytest.mark.parametrize(
-    ('expr', 'expected'),
+    ('expr_fn', 'expected'),
     [
-        param(L(-5).abs(), 5, id='abs-neg'),
-        param(L(5).abs(), 5, id='abs'),
+        param(lambda: L(-5).abs(), 5, id='abs-neg'),
+        param(lambda: L(5).abs(), 5, id='abs'),
         param(
-            ibis.least(L(10), L(1)),
+            lambda: ibis.least(L(10), L(1)),
             1,
             id='least',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
         param(
-            ibis.greatest(L(10), L(1)),
+            lambda: ibis.greatest(L(10), L(1)),
             10,
             id='greatest',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
-        param(L(5.5).round(), 6.0, id='round'),
+        param(lambda: L(5.5).round(), 6.0, id='round'),
         param(
-            L(5.556).round(2),
+            lambda: L(5.556).round(2),
             5.56,
             id='round-digits',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
-        param(L(5.556).ceil(), 6.0, id='ceil'),
-        param(L(5.556).floor(), 5.0, id='floor'),
+        param(lambda: L(5.556).ceil(), 6.0, id='ceil'),
+        param(lambda: L(5.556).floor(), 5.0, id='floor'),
         param(
-            L(5.556).exp(),
+            lambda: L(5.556).exp(),
             math.exp(5.556),
             id='expr',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
         param(
-            L(5.556).sign(),
+            lambda: L(5.556).sign(),
             1,
             id='sign-pos',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
         param(
-            L(-5.556).sign(),
+            lambda: L(-5.556).sign(),
             -1,
             id='sign-neg',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
         param(
-            L(0).sign(),
+            lambda: L(0).sign(),
             0,
             id='sign-zero',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
-        param(L(5.556).sqrt(), math.sqrt(5.556), id='sqrt'),
+        param(lambda: L(5.556).sqrt(), math.sqrt(5.556), id='sqrt'),
         param(
-            L(5.556).log(2),
+            lambda: L(5.556).log(2),
             math.log(5.556, 2),
             id='log-base',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
-        param(L(5.556).ln(), math.log(5.556), id='ln'),
-        param(L(5.556).log2(), math.log(5.556, 2), id='log2'),
-        param(L(5.556).log10(), math.log10(5.556), id='log10'),
+        param(lambda: L(5.556).ln(), math.log(5.556), id='ln'),
+        param(lambda: L(5.556).log2(), math.log(5.556, 2), id='log2'),
+        param(lambda: L(5.556).log10(), math.log10(5.556), id='log10'),
         param(
-            L(5.556).radians(),
+            lambda: L(5.556).radians(),
             math.radians(5.556),
             id='radians',
             marks=pytest.mark.notimpl(["datafusion", "impala"]),
         ),
         param(
-            L(5.556).degrees(),
+            lambda: L(5.556).degrees(),
             math.degrees(5.556),
             id='degrees',
             marks=pytest.mark.notimpl(["datafusion", "impala"]),
         ),
-        param(L(11) % 3, 11 % 3, id='mod'),
+        param(lambda: L(11) % 3, 11 % 3, id='mod'),
     ],
 )
-def test_math_functions_literals(con, expr, expected):
-    result = con.execute(expr)
+def test_math_functions_literals(con, expr_fn, expected):
+    result = con.execute(expr_fn())
     if isinstance(result, decimal.Decimal):
         # in case of Impala the result is decimal
         # >>> decimal.Decimal('5.56') == 5.56
@@ -170,23 +169,28 @@ def test_math_functions_literals(con, expr, expected):
 
 
 @pytest.mark.parametrize(
-    ("expr", "expected"),
+    ("expr_fn", "expected"),
     [
-        param(L(0.0).acos(), math.acos(0.0), id="acos"),
-        param(L(0.0).asin(), math.asin(0.0), id="asin"),
-        param(L(0.0).atan(), math.atan(0.0), id="atan"),
-        param(L(0.0).atan2(1.0), math.atan2(0.0, 1.0), id="atan2"),
-        param(L(0.0).cos(), math.cos(0.0), id="cos"),
-        param(L(1.0).cot(), math.cos(1.0) / math.sin(1.0), id="cot"),
-        param(L(0.0).sin(), math.sin(0.0), id="sin"),
-        param(L(0.0).tan(), math.tan(0.0), id="tan"),
+        param(lambda: L(0.0).acos(), math.acos(0.0), id="acos"),
+        param(lambda: L(0.0).asin(), math.asin(0.0), id="asin"),
+        param(lambda: L(0.0).atan(), math.atan(0.0), id="atan"),
+        param(lambda: L(0.0).atan2(1.0), math.atan2(0.0, 1.0), id="atan2"),
+        param(lambda: L(0.0).cos(), math.cos(0.0), id="cos"),
+        param(lambda: L(1.0).cot(), math.cos(1.0) / math.sin(1.0), id="cot"),
+        param(lambda: L(0.0).sin(), math.sin(0.0), id="sin"),
+        param(lambda: L(0.0).tan(), math.tan(0.0), id="tan"),
     ],
 )
-def test_trig_functions_literals(con, expr, expected):
-    result = con.execute(expr)
+def test_trig_functions_literals(con, expr_fn, expected):
+    result = con.execute(expr_fn())
     assert pytest.approx(result) == expected
 
 
+@pytest.fixture(scope="module")
+def double_col_max(df):
+    return df.double_col.max()
+
+
 @pytest.mark.parametrize(
     ("expr", "expected_fn"),
     [
@@ -207,15 +211,15 @@ def test_trig_functions_literals(con, expr, expected):
         " to missing NullIfZero"
     ),
 )
-def test_trig_functions_columns(backend, expr, alltypes, df, expected_fn):
-    dc_max = df.double_col.max()
-    expr = alltypes.mutate(dc=(_.double_col / dc_max).nullifzero()).select(
-        tmp=expr
-    )
+def test_trig_functions_columns(
+    backend, expr, alltypes, df, double_col_max, expected_fn
+):
+    dc_expr = (_.double_col / double_col_max).nullifzero()
+    expr = alltypes.mutate(dc=dc_expr).select(tmp=expr)
     result = expr.tmp.execute()
-    expected = expected_fn(
-        (df.double_col / dc_max).replace(0.0, np.nan)
-    ).rename("tmp")
+    dc = df.double_col.to_numpy() / double_col_max
+    dc[dc == 0.0] = np.nan
+    expected = pd.Series(expected_fn(dc), index=df.index, name="tmp")
     backend.assert_series_equal(result, expected)
 
 
@@ -325,6 +329,11 @@ def test_complex_math_functions_columns(
     backend.assert_series_equal(result, expected)
 
 
+def rowwise(ufunc, *values):
+    """Reduce columns and scalars element-wise with a binary `ufunc`."""
+    return pd.Series(ufunc.reduce(np.broadcast_arrays(*values)))
+
+
 @pytest.mark.parametrize(
     ('expr_fn', 'expected_fn'),
     [
@@ -341,21 +350,19 @@ def test_complex_math_functions_columns(
         ),
         param(
             lambda be, t: be.least(ibis.least, t.bigint_col, t.int_col),
-            lambda be, t: pd.Series(list(map(min, t.bigint_col, t.int_col))),
+            lambda be, t: rowwise(np.minimum, t.bigint_col, t.int_col),
             id='least-all-columns',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
         param(
             lambda be, t: be.least(ibis.least, t.bigint_col, t.int_col, -2),
-            lambda be, t: pd.Series(
-                list(map(min, t.bigint_col, t.int_col, [-2] * len(t)))
-            ),
+            lambda be, t: rowwise(np.minimum, t.bigint_col, t.int_col, -2),
             id='least-scalar',
             marks=pytest.mark.notimpl(["datafusion", "clickhouse"]),
         ),
         param(
             lambda be, t: be.greatest(ibis.greatest, t.bigint_col, t.int_col),
-            lambda be, t: pd.Series(list(map(max, t.bigint_col, t.int_col))),
+            lambda be, t: rowwise(np.maximum, t.bigint_col, t.int_col),
             id='greatest-all-columns',
             marks=pytest.mark.notimpl(["datafusion"]),
         ),
@@ -363,9 +370,7 @@ def test_complex_math_functions_columns(
             lambda be, t: be.greatest(
                 ibis.greatest, t.bigint_col, t.int_col, -2
             ),
-            lambda be, t: pd.Series(
-                list(map(max, t.bigint_col, t.int_col, [-2] * len(t)))
-            ),
+            lambda be, t: rowwise(np.maximum, t.bigint_col, t.int_col, -2),
             id='greatest-scalar',
             marks=pytest.mark.notimpl(["datafusion", "clickhouse"]),
         ),
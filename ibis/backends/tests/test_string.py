@@ -1,9 +1,14 @@
+import re
+
 import pytest
 from pytest import param
 
 import ibis
 import ibis.expr.datatypes as dt
 
+DIGITS_RE = re.compile(r'\d+')
+DIGITS_GROUP_RE = re.compile(r'(\d+)')
+
 
 def is_text_type(x):
     return isinstance(x, str)
@@ -52,19 +57,19 @@ def test_string_col_is_unicode(alltypes, df):
         ),
         param(
             lambda t: t.string_col.re_search(r'[[:digit:]]+'),
-            lambda t: t.string_col.str.contains(r'\d+'),
+            lambda t: t.string_col.str.contains(DIGITS_RE),
             id='re_search_posix',
             marks=pytest.mark.notimpl(["datafusion", "pyspark", "snowflake"]),
         ),
         param(
             lambda t: t.string_col.re_extract(r'([[:digit:]]+)', 0),
-            lambda t: t.string_col.str.extract(r'(\d+)', expand=False),
+            lambda t: t.string_col.str.extract(DIGITS_GROUP_RE, expand=False),
             id='re_extract_posix',
             marks=pytest.mark.notimpl(["mysql", "pyspark", "snowflake"]),
         ),
         param(
             lambda t: t.string_col.re_replace(r'[[:digit:]]+', 'a'),
-            lambda t: t.string_col.str.replace(r'\d+', 'a', regex=True),
+            lambda t: t.string_col.str.replace(DIGITS_RE, 'a', regex=True),
             id='re_replace_posix',
             marks=pytest.mark.notimpl(
                 ['datafusion', "mysql", "pyspark", "snowflake"]
@@ -72,19 +77,19 @@ def test_string_col_is_unicode(alltypes, df):
         ),
         param(
             lambda t: t.string_col.re_search(r'\d+'),
-            lambda t: t.string_col.str.contains(r'\d+'),
+            lambda t: t.string_col.str.contains(DIGITS_RE),
             id='re_search',
             marks=pytest.mark.notimpl(["impala", "datafusion", "snowflake"]),
         ),
         param(
             lambda t: t.string_col.re_extract(r'(\d+)', 0),
-            lambda t: t.string_col.str.extract(r'(\d+)', expand=False),
+            lambda t: t.string_col.str.extract(DIGITS_GROUP_RE, expand=False),
             id='re_extract',
             marks=pytest.mark.notimpl(["impala", "mysql", "snowflake"]),
         ),
         param(
             lambda t: t.string_col.re_replace(r'\d+', 'a'),
-            lambda t: t.string_col.str.replace(r'\d+', 'a', regex=True),
+            lambda t: t.string_col.str.replace(DIGITS_RE, 'a', regex=True),
             id='re_replace',
             marks=pytest.mark.notimpl(
                 ["impala", "datafusion", "mysql", "snowflake"]
@@ -182,6 +187,12 @@ def test_string_col_is_unicode(alltypes, df):
             id='endswith',
             marks=pytest.mark.notimpl(["dask", "datafusion", "pandas"]),
         ),
+        param(
+            lambda t: t.date_string_col.endswith('/10'),
+            lambda t: t.date_string_col.str.endswith('/10'),
+            id='endswith_match',
+            marks=pytest.mark.notimpl(["dask", "datafusion", "pandas"]),
+        ),
         param(
             lambda t: t.string_col.strip(),
             lambda t: t.string_col.str.strip(),
@@ -228,22 +239,19 @@ def test_string_col_is_unicode(alltypes, df):
             lambda t: t.date_string_col[t.date_string_col.length() - 1 :],
             lambda t: t.date_string_col.str[-1:],
             id='expr_slice_begin',
-            # TODO: substring #2553
-            marks=pytest.mark.notimpl(["dask", "pyspark"]),
+            marks=pytest.mark.notimpl(["dask"], reason="substring - #2553"),
         ),
         param(
             lambda t: t.date_string_col[: t.date_string_col.length()],
             lambda t: t.date_string_col,
             id='expr_slice_end',
-            # TODO: substring #2553
-            marks=pytest.mark.notimpl(["dask", "pyspark"]),
+            marks=pytest.mark.notimpl(["dask"], reason="substring - #2553"),
         ),
         param(
             lambda t: t.date_string_col[:],
             lambda t: t.date_string_col,
             id='expr_empty_slice',
-            # TODO: substring #2553
-            marks=pytest.mark.notimpl(["dask", "pyspark"]),
+            marks=pytest.mark.notimpl(["dask"], reason="substring - #2553"),
         ),
         param(
             lambda t: t.date_string_col[
@@ -251,8 +259,7 @@ def test_string_col_is_unicode(alltypes, df):
             ],
             lambda t: t.date_string_col.str[-2:-1],
             id='expr_slice_begin_end',
-            # TODO: substring #2553
-            marks=pytest.mark.notimpl(["dask", "pyspark"]),
+            marks=pytest.mark.notimpl(["dask"], reason="substring - #2553"),
         ),
         param(
             lambda t: t.date_string_col.split('/'),